@@ -0,0 +1,266 @@
+"""Throughput, latency and allocation benchmarks of the websocket ingest path.
+
+Run from the repository root:
+
+    python benchmarks/bench_api.py [--devices 4] [--frames 4000] [--rate 0]
+                                   [--capture frames.jsonl] [--commands 200]
+
+Three stages are measured on the same messages:
+
+- decode: parsing a frame and decoding it with StateDecoder.
+- dispatch: AnovaOvenApi.run reading a local websocket that replays the
+  messages, up to the listener's on_state. Latency is from the server sending
+  a frame to on_state, frames coalesced by the listener queue are counted.
+  Command round trips (send_command to RESPONSE) are measured after.
+- coordinator: AnovaDeviceCoordinator.async_set_state with listeners for every
+  entity description, the cook session and the telemetry history.
+
+Each stage runs once for timing and once more under tracemalloc, which reports
+the peak memory traced and the memory retained per frame.
+"""
+
+import argparse
+import asyncio
+import json
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+import uuid
+from collections.abc import Awaitable, Callable
+from pathlib import Path
+
+import aiohttp
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from homeassistant.core import HomeAssistant  # noqa: E402
+
+from benchmarks.replay import (  # noqa: E402
+    ReplayServer,
+    load_capture,
+    stamp,
+    state_key,
+    synthesize,
+)
+from custom_components.anova_oven.api import (  # noqa: E402
+    AnovaOvenApi,
+    AnovaOvenUpdateListener,
+)
+from custom_components.anova_oven.binary_sensor import (  # noqa: E402
+    SENSOR_DESCRIPTIONS as BINARY_SENSOR_DESCRIPTIONS,
+)
+from custom_components.anova_oven.codec import loads  # noqa: E402
+from custom_components.anova_oven.const import AnovaUnitOfTemperature  # noqa: E402
+from custom_components.anova_oven.coordinator import (  # noqa: E402
+    AnovaDeviceCoordinator,
+)
+from custom_components.anova_oven.precision_oven import (  # noqa: E402
+    AnovaPrecisionOven,
+    APOCommand,
+    APOState,
+)
+from custom_components.anova_oven.sensor import (  # noqa: E402
+    SESSION_SENSOR_DESCRIPTIONS,
+    sensor_descriptions,
+)
+from custom_components.anova_oven.state_decoder import StateDecoder  # noqa: E402
+from custom_components.anova_oven.telemetry import OvenTelemetry  # noqa: E402
+
+
+class Result:
+    def __init__(self, frames: int, elapsed: float, latencies: list[float]) -> None:
+        self.frames = frames
+        self.elapsed = elapsed
+        self.latencies = latencies
+        self.extra = ""
+
+
+def percentile(values: list[float], pct: float) -> float:
+    return values[min(int(len(values) * pct / 100), len(values) - 1)]
+
+
+def report(name: str, result: Result, peak: int, retained: int) -> None:
+    latencies = sorted(result.latencies) or [0.0]
+    fps = result.frames / result.elapsed if result.elapsed else 0
+    print(
+        f"{name:<12} {result.frames:>7} frames {fps:>10.0f} fps"
+        f"  p50 {percentile(latencies, 50) * 1e6:8.1f}us"
+        f"  p90 {percentile(latencies, 90) * 1e6:8.1f}us"
+        f"  p99 {percentile(latencies, 99) * 1e6:8.1f}us"
+        f"  max {latencies[-1] * 1e6:8.1f}us"
+        f"  peak {peak / 1024:8.1f}KiB"
+        f"  retained {retained / max(result.frames, 1):7.1f}B/frame"
+        f"{result.extra}"
+    )
+
+
+async def measure(name: str, run: Callable[[], Awaitable[Result]]) -> None:
+    result = await run()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    await run()
+    retained, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    report(name, result, peak - before, retained - before)
+
+
+def bench_decode(texts: list[str]) -> Callable[[], Awaitable[Result]]:
+    async def run() -> Result:
+        decoder = StateDecoder()
+        states: dict[str, APOState] = {}
+        latencies = []
+        start = time.perf_counter()
+        for text in texts:
+            begin = time.perf_counter()
+            payload = loads(text)["payload"]
+            cooker_id = payload["cookerId"]
+            states[cooker_id] = decoder.decode(
+                cooker_id, payload["state"], states.get(cooker_id)
+            )
+            latencies.append(time.perf_counter() - begin)
+        return Result(len(texts), time.perf_counter() - start, latencies)
+
+    return run
+
+
+class Listener(AnovaOvenUpdateListener):
+    def __init__(self, server: ReplayServer) -> None:
+        self.server = server
+        self.latencies: list[float] = []
+        self.delivered = 0
+        self.last = 0.0
+
+    async def on_state(self, device: AnovaPrecisionOven, state: APOState):
+        self.last = now = time.perf_counter()
+        self.delivered += 1
+        timer = state.sensor.nodes.timer
+        if timer and (sent := self.server.sent.get((device.cooker_id, timer.current))):
+            self.latencies.append(now - sent)
+
+
+def stop_command(cooker_id: str) -> APOCommand:
+    return APOCommand(
+        command="CMD_APO_STOP",
+        request_id=str(uuid.uuid4()),
+        payload=APOCommand.Payload(type="CMD_APO_STOP", id=cooker_id, payload=None),
+    )
+
+
+def bench_dispatch(
+    messages: list[dict], rate: float, commands: int
+) -> Callable[[], Awaitable[Result]]:
+    frames = sum(state_key(m) is not None for m in messages)
+
+    async def run() -> Result:
+        server = ReplayServer(messages, rate)
+        url = await server.start()
+        async with aiohttp.ClientSession() as session:
+            api = AnovaOvenApi(session, "app-key", "token", "refresh", ws_url=url)
+            listener = Listener(server)
+            api.add_listener(listener)
+            task = asyncio.create_task(api.run())
+            await server.finished.wait()
+            # Wait for the listener queue to drain.
+            delivered = -1
+            while delivered != listener.delivered:
+                delivered = listener.delivered
+                await asyncio.sleep(0.05)
+            elapsed = listener.last - server.started
+
+            round_trips = []
+            cooker_id = next(iter(api.devices), "oven-0")
+            for _ in range(commands):
+                begin = time.perf_counter()
+                await api.send_command(stop_command(cooker_id))
+                round_trips.append(time.perf_counter() - begin)
+
+            await api.stop()
+            await task
+        await server.stop()
+
+        result = Result(frames, elapsed, listener.latencies)
+        result.extra = f"  coalesced {frames - listener.delivered}"
+        if round_trips:
+            result.extra += (
+                f"  command p50 {statistics.median(round_trips) * 1e6:.0f}us"
+            )
+        return result
+
+    return run
+
+
+def bench_coordinator(texts: list[str]) -> Callable[[], Awaitable[Result]]:
+    decoder = StateDecoder()
+    states: list[tuple[str, APOState]] = []
+    previous: dict[str, APOState] = {}
+    for text in texts:
+        payload = loads(text)["payload"]
+        cooker_id = payload["cookerId"]
+        state = previous[cooker_id] = decoder.decode(
+            cooker_id, payload["state"], previous.get(cooker_id)
+        )
+        states.append((cooker_id, state))
+    descriptions = [
+        *sensor_descriptions(AnovaUnitOfTemperature.CELSIUS),
+        *SESSION_SENSOR_DESCRIPTIONS,
+        *BINARY_SENSOR_DESCRIPTIONS,
+    ]
+
+    async def run() -> Result:
+        hass = HomeAssistant(tempfile.mkdtemp())
+        coordinators: dict[str, AnovaDeviceCoordinator] = {}
+        telemetry: dict[str, OvenTelemetry] = {}
+        updates = 0
+
+        def on_update() -> None:
+            nonlocal updates
+            updates += 1
+
+        for cooker_id in previous:
+            coordinator = coordinators[cooker_id] = AnovaDeviceCoordinator(
+                hass, AnovaPrecisionOven(cooker_id, "oven_v2")
+            )
+            for description in descriptions:
+                coordinator.async_add_listener(on_update, description.state_keys)
+            telemetry[cooker_id] = OvenTelemetry()
+
+        latencies = []
+        start = time.perf_counter()
+        for cooker_id, state in states:
+            begin = time.perf_counter()
+            coordinators[cooker_id].async_set_state(state)
+            telemetry[cooker_id].record(time.time(), state)
+            latencies.append(time.perf_counter() - begin)
+        result = Result(len(states), time.perf_counter() - start, latencies)
+        result.extra = f"  entity updates {updates}"
+        await hass.async_stop(force=True)
+        return result
+
+    return run
+
+
+async def main(args: argparse.Namespace) -> None:
+    if args.capture:
+        messages = stamp(load_capture(args.capture))
+    else:
+        messages = synthesize(args.devices, args.frames)
+    texts = [json.dumps(m) for m in messages if state_key(m) is not None]
+    await measure("decode", bench_decode(texts))
+    await measure("dispatch", bench_dispatch(messages, args.rate, args.commands))
+    await measure("coordinator", bench_coordinator(texts))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--devices", type=int, default=4, help="ovens to simulate")
+    parser.add_argument("--frames", type=int, default=4000, help="state frames")
+    parser.add_argument(
+        "--rate", type=float, default=0, help="messages per second, 0 is unlimited"
+    )
+    parser.add_argument("--capture", help="JSON lines file of messages to replay")
+    parser.add_argument(
+        "--commands", type=int, default=200, help="command round trips to measure"
+    )
+    asyncio.run(main(parser.parse_args()))
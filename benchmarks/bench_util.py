@@ -0,0 +1,176 @@
+"""Micro-benchmarks for the key case converters and serializer in util.py.
+
+Run from the repository root: python benchmarks/bench_util.py
+"""
+
+import re
+import sys
+import timeit
+from dataclasses import fields, is_dataclass
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from custom_components.anova_oven.precision_oven import (  # noqa: E402
+    APOCommand,
+    APOStage,
+)
+from custom_components.anova_oven.util import (  # noqa: E402
+    dict_keys_to_camel_case,
+    dict_keys_to_snake_case,
+    to_camel_case_dict,
+)
+
+NUMBER = 2000
+
+
+def legacy_snake_case_to_camel_case(input_string):
+    words = re.split("-|_", input_string)
+    camel_case_words = [words[0]] + [word.capitalize() for word in words[1:]]
+    return "".join(camel_case_words)
+
+
+def legacy_camel_to_snake(name):
+    s1 = re.sub("(.)([A-Z][a-z]+)", r"\1_\2", name)
+    return re.sub("([a-z0-9])([A-Z])", r"\1_\2", s1).lower()
+
+
+def legacy_dict_keys_to_camel_case(data: dict):
+    res = {}
+    for k, v in data.items():
+        if isinstance(v, dict):
+            v = legacy_dict_keys_to_camel_case(v)
+        elif isinstance(v, list):
+            v = [legacy_dict_keys_to_camel_case(x) for x in v]
+        res[legacy_snake_case_to_camel_case(k)] = v
+    return res
+
+
+def legacy_dict_keys_to_snake_case(data: dict):
+    res = {}
+    for k, v in data.items():
+        if isinstance(v, dict):
+            v = legacy_dict_keys_to_snake_case(v)
+        elif isinstance(v, list):
+            v = [legacy_dict_keys_to_snake_case(x) for x in v]
+        res[legacy_camel_to_snake(k)] = v
+    return res
+
+
+def legacy_to_dict(instance):
+    res = {}
+    for field in fields(instance):
+        value = getattr(instance, field.name)
+        if is_dataclass(value):
+            value = legacy_to_dict(value)
+        elif isinstance(value, list):
+            value = [legacy_to_dict(x) if is_dataclass(x) else x for x in value]
+        if value is not None:
+            res[field.name] = value
+    return res
+
+
+def legacy_serialize(command) -> dict:
+    return legacy_dict_keys_to_camel_case(legacy_to_dict(command))
+
+
+def stage(idx: int, stage_type: str, celsius: int) -> APOStage:
+    setpoint = APOStage.TemperatureSetpoint(
+        celsius=celsius, fahrenheit=int(celsius * 1.8 + 32)
+    )
+    return APOStage(
+        id=f"android-stage-{idx}",
+        title="",
+        type=stage_type,
+        temperature_bulbs=APOStage.TemperatureBulbs(
+            mode="dry", dry=APOStage.TemperatureBulb(setpoint=setpoint)
+        ),
+        heating_elements=APOStage.HeatingElements(
+            bottom=APOStage.On(on=False),
+            top=APOStage.On(on=idx % 2 == 0),
+            rear=APOStage.On(on=True),
+        ),
+        fan=APOStage.Fan(speed=100),
+        vent=APOStage.Vent(open=False),
+        steam_generators=APOStage.SteamGenerators(
+            mode="steam-percentage",
+            relative_humidity=None,
+            steam_percentage=APOStage.SteamGenerators.Setpoint(setpoint=30),
+        ),
+        timer_added=stage_type == "cook",
+        timer=APOStage.Timer(initial=1800) if stage_type == "cook" else None,
+    )
+
+
+def start_command(stages: int) -> APOCommand:
+    return APOCommand(
+        command="CMD_APO_START",
+        request_id="request",
+        payload=APOCommand.Payload(
+            id="cooker",
+            type="CMD_APO_START",
+            payload=APOCommand.APOStartPayload(
+                cook_id="cook",
+                stages=[
+                    stage(i, "preheat" if i % 2 == 0 else "cook", 180 + i * 10)
+                    for i in range(stages)
+                ],
+            ),
+        ),
+    )
+
+
+def custom_start_command(stages: int) -> APOCommand:
+    """Stages built from JSON like start_custom_cook, nested fields are dicts."""
+    command = start_command(stages)
+    command.payload.payload.stages = [
+        APOStage(**dict_keys_to_snake_case(to_camel_case_dict(stage)))
+        for stage in command.payload.payload.stages
+    ]
+    return command
+
+
+def bench(name: str, legacy, current, data) -> None:
+    assert legacy(data) == current(data)
+    legacy_time = timeit.timeit(lambda: legacy(data), number=NUMBER)
+    current_time = timeit.timeit(lambda: current(data), number=NUMBER)
+    print(
+        f"{name:<32} legacy {legacy_time / NUMBER * 1e6:8.1f}us"
+        f"  current {current_time / NUMBER * 1e6:8.1f}us"
+        f"  x{legacy_time / current_time:.1f}"
+    )
+
+
+def main() -> None:
+    for stages in (1, 3, 10):
+        command = start_command(stages)
+        snake = legacy_to_dict(command)
+        camel = dict_keys_to_camel_case(snake)
+        bench(
+            f"to camel case, {stages} stages",
+            legacy_dict_keys_to_camel_case,
+            dict_keys_to_camel_case,
+            snake,
+        )
+        bench(
+            f"to snake case, {stages} stages",
+            legacy_dict_keys_to_snake_case,
+            dict_keys_to_snake_case,
+            camel,
+        )
+        bench(
+            f"serialize, {stages} stages",
+            legacy_serialize,
+            to_camel_case_dict,
+            command,
+        )
+        bench(
+            f"serialize custom, {stages} stages",
+            legacy_serialize,
+            to_camel_case_dict,
+            custom_start_command(stages),
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,264 @@
+"""Local websocket server replaying Anova cloud traffic for the benchmarks.
+
+Messages are either synthesized for a number of ovens or loaded from a
+capture: a JSON lines file with one websocket message per line, as sent by
+the cloud (EVENT_APO_WIFI_LIST, EVENT_APO_STATE, RESPONSE, ...).
+"""
+
+import asyncio
+import copy
+import json
+import time
+from pathlib import Path
+
+import aiohttp
+from aiohttp import web
+
+
+def temperature(celsius: float) -> dict:
+    return {"celsius": round(celsius, 1), "fahrenheit": round(celsius * 1.8 + 32, 1)}
+
+
+STAGES = [
+    {
+        "id": "android-stage-1",
+        "type": "preheat",
+        "stepType": "stage",
+        "title": "",
+        "description": "",
+        "userActionRequired": False,
+        "temperatureBulbs": {"mode": "dry", "dry": {"setpoint": temperature(180)}},
+        "heatingElements": {
+            "top": {"on": False},
+            "bottom": {"on": False},
+            "rear": {"on": True},
+        },
+        "fan": {"speed": 100},
+        "vent": {"open": False},
+        "rackPosition": 3,
+    },
+    {
+        "id": "android-stage-2",
+        "type": "cook",
+        "stepType": "stage",
+        "title": "",
+        "description": "",
+        "userActionRequired": False,
+        "temperatureBulbs": {"mode": "dry", "dry": {"setpoint": temperature(180)}},
+        "heatingElements": {
+            "top": {"on": False},
+            "bottom": {"on": False},
+            "rear": {"on": True},
+        },
+        "fan": {"speed": 100},
+        "vent": {"open": False},
+        "rackPosition": 3,
+        "timerAdded": True,
+        "timerStarted": True,
+        "timer": {"initial": 3600},
+    },
+]
+
+STATE = {
+    "version": 1,
+    "updatedTimestamp": "2024-01-01T00:00:00Z",
+    "systemInfo": {
+        "online": True,
+        "hardwareVersion": "2.0",
+        "firmwareVersion": "2.1.7",
+    },
+    "state": {"mode": "cook", "temperatureUnit": "C", "processedCommandIds": []},
+    "nodes": {
+        "temperatureBulbs": {
+            "mode": "dry",
+            "wet": {
+                "current": temperature(60),
+                "setpoint": temperature(60),
+                "dosed": False,
+                "doseFailed": False,
+            },
+            "dry": {"current": temperature(20), "setpoint": temperature(180)},
+            "dryTop": {"current": temperature(20), "overheated": False},
+            "dryBottom": {"current": temperature(20), "overheated": False},
+        },
+        "timer": {"mode": "running", "initial": 3600, "current": 0},
+        "temperatureProbe": {"connected": False},
+        "steamGenerators": {
+            "mode": "steam-percentage",
+            "steamPercentage": {"setpoint": 0},
+            "relativeHumidity": {"current": 30},
+            "evaporator": {
+                "failed": False,
+                "overheated": False,
+                "celsius": 50,
+                "watts": 0,
+            },
+            "boiler": {
+                "descaleRequired": False,
+                "failed": False,
+                "overheated": False,
+                "celsius": 50,
+                "watts": 0,
+                "dosed": False,
+            },
+        },
+        "heatingElements": {
+            "top": {"on": False, "failed": False, "watts": 0},
+            "bottom": {"on": False, "failed": False, "watts": 0},
+            "rear": {"on": True, "failed": False, "watts": 1600},
+        },
+        "fan": {"speed": 100, "failed": False},
+        "vent": {"open": False},
+        "waterTank": {"empty": False},
+        "door": {"closed": True},
+        "lamp": {"on": True, "failed": False, "preference": "on"},
+        "userInterfaceCircuit": {"communicationFailed": False},
+    },
+    "cook": {
+        "cookId": "android-cook-1",
+        "activeStageId": "android-stage-2",
+        "stageTransitionPendingUserAction": False,
+        "secondsElapsed": 0,
+        "stages": STAGES,
+    },
+}
+
+
+def wifi_list(cooker_ids: list[str]) -> dict:
+    return {
+        "command": "EVENT_APO_WIFI_LIST",
+        "payload": [
+            {
+                "cookerId": cooker_id,
+                "type": "oven_v2",
+                "name": cooker_id,
+                "pairedAt": "2024-01-01T00:00:00Z",
+                "online": True,
+            }
+            for cooker_id in cooker_ids
+        ],
+    }
+
+
+def state_frame(cooker_id: str, second: int) -> dict:
+    """State of an oven ``second`` seconds into a cook, heating up to 180°C.
+
+    Like a real oven most nodes are unchanged from one frame to the next,
+    the cavity temperatures, timer and elapsed time move.
+    """
+    state = copy.deepcopy(STATE)
+    bulbs = state["nodes"]["temperatureBulbs"]
+    celsius = min(20 + second * 0.25, 180)
+    bulbs["dry"]["current"] = temperature(celsius)
+    bulbs["dryTop"]["current"] = temperature(celsius - 0.5)
+    bulbs["dryBottom"]["current"] = temperature(celsius + 0.5)
+    state["nodes"]["timer"]["current"] = second
+    state["cook"]["secondsElapsed"] = second
+    return {
+        "command": "EVENT_APO_STATE",
+        "payload": {"cookerId": cooker_id, "type": "oven_v2", "state": state},
+    }
+
+
+def synthesize(devices: int, frames: int) -> list[dict]:
+    """A device list then ``frames`` state frames round robin over the ovens."""
+    cooker_ids = [f"oven-{idx}" for idx in range(devices)]
+    return [wifi_list(cooker_ids)] + [
+        state_frame(cooker_ids[idx % devices], idx // devices) for idx in range(frames)
+    ]
+
+
+def load_capture(path: str) -> list[dict]:
+    lines = Path(path).read_text(encoding="utf-8").splitlines()
+    return [json.loads(line) for line in lines if line.strip()]
+
+
+def state_key(message: dict) -> tuple[str, int] | None:
+    """Identify a state frame by its cooker and timer, None for other messages."""
+    if message.get("command") != "EVENT_APO_STATE":
+        return None
+    payload = message["payload"]
+    timer = payload["state"].get("nodes", {}).get("timer")
+    return (payload["cookerId"], timer["current"]) if timer else None
+
+
+def stamp(messages: list[dict]) -> list[dict]:
+    """Give every state frame a unique timer so its delivery can be matched."""
+    stamped = []
+    for seq, message in enumerate(messages):
+        if state_key(message) is not None:
+            message = copy.deepcopy(message)
+            message["payload"]["state"]["nodes"]["timer"]["current"] = seq
+        stamped.append(message)
+    return stamped
+
+
+class ReplayServer:
+    """Replays messages to every client connecting, answers their commands.
+
+    ``rate`` is in messages per second, 0 replays as fast as the client reads.
+    Send times of the state frames are kept by ``state_key`` in ``sent``.
+    """
+
+    def __init__(self, messages: list[dict], rate: float = 0) -> None:
+        self.messages = [(json.dumps(m), state_key(m)) for m in messages]
+        self.rate = rate
+        self.sent: dict[tuple[str, int], float] = {}
+        self.started = 0.0
+        self.finished = asyncio.Event()
+        self.commands = 0
+        self._runner: web.AppRunner | None = None
+
+    async def start(self) -> str:
+        """Start listening on a free local port, return the websocket url."""
+        app = web.Application()
+        app.router.add_get("/", self._handle)
+        self._runner = web.AppRunner(app)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, "127.0.0.1", 0)
+        await site.start()
+        port = self._runner.addresses[0][1]
+        return f"ws://127.0.0.1:{port}/"
+
+    async def stop(self) -> None:
+        if self._runner:
+            await self._runner.cleanup()
+
+    async def _handle(self, request: web.Request) -> web.WebSocketResponse:
+        ws = web.WebSocketResponse(protocols=("ANOVA_V2",))
+        await ws.prepare(request)
+        answering = asyncio.create_task(self._answer(ws))
+        await self._replay(ws)
+        await answering
+        return ws
+
+    async def _replay(self, ws: web.WebSocketResponse) -> None:
+        interval = 1 / self.rate if self.rate else 0
+        self.started = start = time.perf_counter()
+        for idx, (data, key) in enumerate(self.messages):
+            if interval:
+                if (delay := start + idx * interval - time.perf_counter()) > 0:
+                    await asyncio.sleep(delay)
+            elif idx % 32 == 0:
+                # Let the client read, both ends share the event loop.
+                await asyncio.sleep(0)
+            if key is not None:
+                self.sent[key] = time.perf_counter()
+            await ws.send_str(data)
+        self.finished.set()
+
+    async def _answer(self, ws: web.WebSocketResponse) -> None:
+        async for msg in ws:
+            if msg.type != aiohttp.WSMsgType.TEXT:
+                continue
+            command = json.loads(msg.data)
+            self.commands += 1
+            await ws.send_str(
+                json.dumps(
+                    {
+                        "command": "RESPONSE",
+                        "requestId": command["requestId"],
+                        "payload": {"status": "ok"},
+                    }
+                )
+            )
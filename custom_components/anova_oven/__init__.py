@@ -2,10 +2,11 @@
 
 from __future__ import annotations
 
-import dataclasses
 import json
 import uuid
 
+import voluptuous as vol
+
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import (
     ATTR_DEVICE_ID,
@@ -14,25 +15,73 @@ from homeassistant.const import (
     CONF_TEMPERATURE_UNIT,
     Platform,
 )
-from homeassistant.core import HomeAssistant, ServiceCall
+from homeassistant.core import (
+    HomeAssistant,
+    ServiceCall,
+    ServiceResponse,
+    SupportsResponse,
+)
 from homeassistant.exceptions import ConfigEntryNotReady
 from homeassistant.helpers import aiohttp_client, device_registry
+from homeassistant.helpers import config_validation as cv
+from homeassistant.helpers.storage import Store
 from homeassistant.helpers.typing import ConfigType
+from homeassistant.util import dt as dt_util
 
 from .api import AnovaOvenApi
+from .connection import async_get_connection
 from .const import (
     CONF_APP_KEY,
     CONF_REFRESH_TOKEN,
+    DATA_DEVICES,
     DOMAIN,
     PLATFORM,
+    STORAGE_KEY,
+    STORAGE_VERSION,
     AnovaUnitOfTemperature,
 )
 from .coordinator import AnovaCoordinator
 from .precision_oven import AnovaPrecisionOven, APOCommand, APOStage
+from .recipe import RecipeBook, start_cook_template, start_message
+from .telemetry import CHANNELS, TEMPERATURE_CHANNELS
+from .update_policy import update_policies
 from .util import to_celsius, to_fahrenheit, dict_keys_to_snake_case
 
 PLATFORMS: list[Platform] = [Platform.SENSOR, Platform.BINARY_SENSOR]
 
+TELEMETRY_RESOLUTIONS = {"1s": 1, "10s": 10, "1min": 60}
+
+GET_TELEMETRY_SCHEMA = vol.Schema(
+    {
+        vol.Required(ATTR_DEVICE_ID): cv.string,
+        vol.Optional("resolution", default="10s"): vol.In(TELEMETRY_RESOLUTIONS),
+        # Without an offset the start is in the local time zone.
+        vol.Optional("start"): vol.All(cv.datetime, dt_util.as_utc),
+        vol.Optional("channels"): vol.All(cv.ensure_list, [vol.In(CHANNELS)]),
+    }
+)
+
+
+REGISTER_RECIPE_SCHEMA = vol.Schema(
+    {
+        vol.Required("name"): cv.string,
+        vol.Required("config"): vol.Any(cv.string, [dict]),
+    }
+)
+
+START_RECIPE_SCHEMA = vol.Schema(
+    {
+        vol.Required(ATTR_DEVICE_ID): cv.string,
+        vol.Required("name"): cv.string,
+        vol.Optional("target_temperature"): vol.Coerce(float),
+        vol.Optional("temperature_probe"): vol.Coerce(float),
+        vol.Optional("target_humidity"): vol.All(
+            vol.Coerce(int), vol.Range(min=0, max=100)
+        ),
+        vol.Optional("timer"): cv.time_period,
+    }
+)
+
 
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Set up Anova Precision Oven from a config entry."""
@@ -48,17 +97,26 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
         )
         for device in data[CONF_DEVICES]
     ]
-    api = AnovaOvenApi(
-        session=aiohttp_client.async_get_clientsession(hass),
-        app_key=data[CONF_APP_KEY],
-        access_token=data[CONF_ACCESS_TOKEN],
-        refresh_token=data[CONF_REFRESH_TOKEN],
-        existing_devices=devices,
+    connection = async_get_connection(
+        hass,
+        entry,
+        lambda: AnovaOvenApi(
+            session=aiohttp_client.async_get_clientsession(hass),
+            app_key=data[CONF_APP_KEY],
+            access_token=data[CONF_ACCESS_TOKEN],
+            refresh_token=data[CONF_REFRESH_TOKEN],
+        ),
+    )
+    coordinator = AnovaCoordinator(
+        connection=connection,
+        hass=hass,
+        entry=entry,
+        devices=connection.api.add_devices(devices),
         unit_of_temperature=data.get(
             CONF_TEMPERATURE_UNIT, AnovaUnitOfTemperature.CELSIUS
         ),
+        update_policies=update_policies(entry.options),
     )
-    coordinator = AnovaCoordinator(api=api, hass=hass, entry=entry, devices=devices)
     await coordinator.async_setup()
     hass.data[DOMAIN][entry.entry_id] = coordinator
 
@@ -70,37 +128,33 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
 async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Unload a config entry."""
     if unload_ok := await hass.config_entries.async_unload_platforms(entry, PLATFORMS):
-        hass.data[DOMAIN].pop(entry.entry_id)
+        coordinator: AnovaCoordinator = hass.data[DOMAIN].pop(entry.entry_id)
+        await coordinator.async_unload()
 
     return unload_ok
 
 
+async def async_remove_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Remove the stored oven states of a deleted config entry."""
+    await Store(
+        hass, STORAGE_VERSION, STORAGE_KEY.format(entry.entry_id)
+    ).async_remove()
+
+
 async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
     """Set up  component."""
     # hass.data[DOMAIN] = {}
 
     def get_api(device_id) -> tuple[str, AnovaOvenApi]:
-        cook_id = None
-        api: AnovaOvenApi | None = None
-        dr = device_registry.async_get(hass)
-        if device := dr.async_get(device_id):
-            for ce_key in device.config_entries:
-                if ce := hass.data[DOMAIN].get(ce_key):
-                    api: AnovaOvenApi = ce.api
-                    for k, v in device.identifiers:
-                        if k == DOMAIN:
-                            cook_id = v
-                            break
-        if not api or not device_id:
-            raise ConfigEntryNotReady("Device is not found or doesn't ready.")
-        return cook_id, api
+        cook_id, coordinator = get_device_coordinator(hass, device_id)
+        return cook_id, coordinator.api
 
     async def start_cook(call: ServiceCall):
-        api: AnovaOvenApi
-        cook_id, api = get_api(call.data[ATTR_DEVICE_ID])
+        cook_id, coordinator = get_device_coordinator(hass, call.data[ATTR_DEVICE_ID])
+        api: AnovaOvenApi = coordinator.api
         timer = call.data.get("timer")
         probe = call.data.get("temperature_probe")
-        uot = api.unit_of_temperature
+        uot = coordinator.unit_of_temperature
         if timer and probe:
             raise ValueError("Only probe or timer can be setup at one.")
 
@@ -167,95 +221,32 @@ async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
                     raise ValueError(
                         "Target temprature could not exceed 212°F in souse vide mode."
                     )
-        preheat_stage = APOStage(
-            step_type="stage",
-            id=f"{PLATFORM}-{uuid.uuid4()}",
-            title="",
-            description="",
-            type="preheat",
+        template = start_cook_template(
+            sous_vide=sous_vide,
+            preheat_required=preheat_required,
             user_action_required=user_action_required,
-            temperature_bulbs=APOStage.TemperatureBulbs(
-                dry=APOStage.TemperatureBulb(
-                    setpoint=APOStage.TemperatureSetpoint(
-                        celsius=target_temperature_celsius,
-                        fahrenheit=target_temperature_fahrenheit,
-                    )
-                )
-                if not sous_vide
-                else None,
-                wet=APOStage.TemperatureBulb(
-                    setpoint=APOStage.TemperatureSetpoint(
-                        celsius=target_temperature_celsius,
-                        fahrenheit=target_temperature_fahrenheit,
-                    )
-                )
-                if sous_vide
-                else None,
-                mode="wet" if sous_vide else "dry",
-            ),
-            heating_elements=APOStage.HeatingElements(
-                bottom=APOStage.On(on=call.data.get("heating_bottom", False)),
-                top=APOStage.On(on=call.data.get("heating_top", False)),
-                rear=APOStage.On(on=call.data.get("heating_rear", True)),
-            ),
-            fan=APOStage.Fan(speed=100),
-            vent=APOStage.Vent(open=False),
-            rack_position=3,
-            steam_generators=APOStage.SteamGenerators(
-                mode="relative-humidity" if sous_vide else "steam-percentage",
-                relative_humidity=APOStage.SteamGenerators.Setpoint(
-                    setpoint=call.data.get("target_humidity", 100 if sous_vide else 0)
-                )
-                if sous_vide
-                else None,
-                steam_percentage=APOStage.SteamGenerators.Setpoint(
-                    setpoint=call.data.get("target_humidity", 0)
-                )
-                if not sous_vide
-                else None,
-            )
-            if call.data.get("target_humidity") or sous_vide
-            else None,
+            heating_bottom=call.data.get("heating_bottom", False),
+            heating_top=call.data.get("heating_top", False),
+            heating_rear=call.data.get("heating_rear", True),
+            steam=bool(call.data.get("target_humidity")) or sous_vide,
             probe_added=temperature_probe_celsius is not None,
-            temperature_probe=APOStage.Probe(
-                setpoint=APOStage.TemperatureSetpoint(
-                    celsius=temperature_probe_celsius,
-                    fahrenheit=temperature_probe_fahrenheit,
-                )
-            )
-            if temperature_probe_celsius is not None
-            else None,
-        )
-        cook_stage = dataclasses.replace(
-            preheat_stage,
-            id=f"{PLATFORM}-{uuid.uuid4()}",
-            type="cook",
-            user_action_required=user_action_required,
             timer_added=timer is not None,
-            timer=APOStage.Timer(
-                initial=timer["hours"] * 3600 + timer["minutes"] * 60 + timer["seconds"]
-            )
+        )
+        stages = template.render(
+            temperature={
+                "fahrenheit": target_temperature_fahrenheit,
+                "celsius": target_temperature_celsius,
+            },
+            probe={
+                "fahrenheit": temperature_probe_fahrenheit,
+                "celsius": temperature_probe_celsius,
+            },
+            humidity=call.data.get("target_humidity", 100 if sous_vide else 0),
+            timer=timer["hours"] * 3600 + timer["minutes"] * 60 + timer["seconds"]
             if timer
             else None,
         )
-        stages = []
-        if preheat_required:
-            stages.append(preheat_stage)
-        stages.append(cook_stage)
-        await api.send_command(
-            APOCommand(
-                command="CMD_APO_START",
-                request_id=str(uuid.uuid4()),
-                payload=APOCommand.Payload(
-                    payload=APOCommand.APOStartPayload(
-                        cook_id=f"{PLATFORM}-{uuid.uuid4()}",
-                        stages=stages,
-                    ),
-                    type="CMD_APO_START",
-                    id=cook_id,
-                ),
-            )
-        )
+        await api.send_message(start_message(cook_id, stages))
 
     async def start_custom_cook(call: ServiceCall):
         cook_id, api = get_api(call.data[ATTR_DEVICE_ID])
@@ -291,6 +282,28 @@ async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
             )
         )
 
+    async def register_recipe(call: ServiceCall):
+        config = call.data["config"]
+        recipes.register(
+            call.data["name"], json.loads(config) if isinstance(config, str) else config
+        )
+
+    async def start_recipe(call: ServiceCall):
+        cook_id, coordinator = get_device_coordinator(hass, call.data[ATTR_DEVICE_ID])
+        uot = coordinator.unit_of_temperature
+        timer = call.data.get("timer")
+        stages = recipes.get(call.data["name"]).render(
+            temperature=temperature_setpoint(call.data.get("target_temperature"), uot),
+            probe=temperature_setpoint(call.data.get("temperature_probe"), uot),
+            humidity=call.data.get("target_humidity"),
+            timer=int(timer.total_seconds()) if timer else None,
+        )
+        await coordinator.api.send_message(start_message(cook_id, stages))
+
+    async def get_telemetry(call: ServiceCall) -> ServiceResponse:
+        cook_id, coordinator = get_device_coordinator(hass, call.data[ATTR_DEVICE_ID])
+        return telemetry_response(coordinator, cook_id, call.data)
+
     hass.services.async_register(
         DOMAIN,
         "start_cook",
@@ -309,9 +322,97 @@ async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
         stop_cook,
     )
 
+    recipes = RecipeBook(hass)
+    await recipes.async_load()
+
+    hass.services.async_register(
+        DOMAIN,
+        "register_recipe",
+        register_recipe,
+        schema=REGISTER_RECIPE_SCHEMA,
+    )
+
+    hass.services.async_register(
+        DOMAIN,
+        "start_recipe",
+        start_recipe,
+        schema=START_RECIPE_SCHEMA,
+    )
+
+    hass.services.async_register(
+        DOMAIN,
+        "get_telemetry",
+        get_telemetry,
+        schema=GET_TELEMETRY_SCHEMA,
+        supports_response=SupportsResponse.ONLY,
+    )
+
     return True
 
 
+def get_device_coordinator(
+    hass: HomeAssistant, device_id: str
+) -> tuple[str, AnovaCoordinator]:
+    """Return the cooker id and entry coordinator of a device.
+
+    Resolved devices are cached until the device registry changes them.
+    """
+    resolved = hass.data.setdefault(DATA_DEVICES, {})
+    if (cached := resolved.get(device_id)) is not None:
+        return cached
+    cook_id = None
+    coordinator: AnovaCoordinator | None = None
+    dr = device_registry.async_get(hass)
+    if device := dr.async_get(device_id):
+        for ce_key in device.config_entries:
+            if ce := hass.data[DOMAIN].get(ce_key):
+                coordinator = ce
+                for k, v in device.identifiers:
+                    if k == DOMAIN:
+                        cook_id = v
+                        break
+    # The entry's cloud service device is not an oven.
+    if not coordinator or cook_id not in coordinator.coordinators:
+        raise ConfigEntryNotReady("Device is not found or doesn't ready.")
+    resolved[device_id] = cook_id, coordinator
+    return cook_id, coordinator
+
+
+def temperature_setpoint(
+    value: float | None, uot: AnovaUnitOfTemperature
+) -> dict | None:
+    """Return a stage setpoint of a temperature in the entry's unit."""
+    if value is None:
+        return None
+    if uot == AnovaUnitOfTemperature.FAHRENHEIT:
+        return {"fahrenheit": value, "celsius": to_celsius(value)}
+    return {"fahrenheit": to_fahrenheit(value), "celsius": value}
+
+
+def telemetry_response(
+    coordinator: AnovaCoordinator, cook_id: str, data: dict
+) -> ServiceResponse:
+    """Build the get_telemetry response of an oven."""
+    uot = coordinator.unit_of_temperature
+    if (telemetry := coordinator.telemetry.get(cook_id)) is None:
+        return {"unit_of_temperature": uot, "timestamps": []}
+    # Defaults to the running or last cook.
+    if (start := data.get("start")) is not None:
+        start = start.timestamp()
+    else:
+        start = telemetry.cook_started
+    history = telemetry.history(
+        TELEMETRY_RESOLUTIONS[data["resolution"]], start, data.get("channels")
+    )
+    if uot == AnovaUnitOfTemperature.FAHRENHEIT:
+        for channel in TEMPERATURE_CHANNELS:
+            if values := history.get(channel):
+                history[channel] = [
+                    None if v is None else round(v * 1.8 + 32, 2) for v in values
+                ]
+    return {"unit_of_temperature": uot, "cook_id": telemetry.cook_id, **history}
+
+
 async def update_listener(hass: HomeAssistant, entry: ConfigEntry) -> None:
     """Handle options update."""
     await hass.config_entries.async_reload(entry.entry_id)
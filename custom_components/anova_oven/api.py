@@ -1,28 +1,126 @@
 import asyncio
-import json
+import itertools
 import logging
+import random
 import time
 from abc import ABC
+from collections import OrderedDict
+from http import HTTPStatus
 
 import aiohttp
 from aiohttp.client_ws import ClientWebSocketResponse
 
-from .const import PLATFORM, AnovaUnitOfTemperature
-from .exceptions import CommandError, InvalidAuth, NoDevicesFound
+from .codec import dumps, loads, sniff_command
+from .const import PLATFORM
+from .exceptions import AnovaOffline, CommandError, InvalidAuth, NoDevicesFound
+from .metrics import ApiMetrics
 from .precision_oven import (
     AnovaPrecisionOven,
     APOCommand,
-    APOSensor,
     APOState,
-    ProbeTarget,
     Target,
-    Temperature,
-    TimerTarget,
+    TargetTracker,
+    cook_target,
 )
-from .util import dict_keys_to_camel_case, snake_case_to_camel_case, to_dict
+from .state_decoder import StateDecoder
+from .util import to_camel_case_dict, token_expires_in
 
 _LOGGER = logging.getLogger(__name__)
 
+WS_URL = "https://devices.anovaculinary.io/"
+TOKEN_URL = "https://securetoken.googleapis.com/v1/token"
+
+COMMAND_TIMEOUT = 10
+# How long to wait for the device list.
+DISCOVERY_TIMEOUT = 5.5
+# Ping interval, a missing pong closes the connection.
+HEARTBEAT = 30
+# Ovens report at least every few seconds, a silent socket is considered dead.
+IDLE_TIMEOUT = 120
+# Refresh the access token when it expires sooner than this.
+TOKEN_REFRESH_MARGIN = 300
+# Frames with any other command are dropped before they are parsed.
+HANDLED_COMMANDS = frozenset({"EVENT_APO_STATE", "EVENT_APO_WIFI_LIST", "RESPONSE"})
+# Events a listener may lag behind before the oldest ones are dropped.
+LISTENER_QUEUE_SIZE = 100
+
+
+class Backoff:
+    """Capped exponential backoff with jitter."""
+
+    def __init__(self, base: float = 1, cap: float = 300) -> None:
+        self.base = base
+        self.cap = cap
+        self._attempt = 0
+
+    def reset(self) -> None:
+        self._attempt = 0
+
+    def next(self) -> float:
+        delay = min(self.cap, self.base * 2**self._attempt)
+        self._attempt += 1
+        return random.uniform(delay / 2, delay)
+
+
+class ListenerDispatcher:
+    """Delivers events to one listener on its own task.
+
+    Publishing never waits for the listener. Pending states are coalesced per
+    cooker (the latest one wins), other events are queued up to ``maxsize``
+    after which the oldest pending event is dropped.
+    """
+
+    def __init__(
+        self,
+        listener: "AnovaOvenUpdateListener",
+        maxsize: int = LISTENER_QUEUE_SIZE,
+        metrics: ApiMetrics | None = None,
+    ) -> None:
+        self.listener = listener
+        self.maxsize = maxsize
+        self.metrics = metrics or ApiMetrics()
+        # key -> (method name, args), states are keyed by cooker id.
+        self._pending: OrderedDict[tuple, tuple[str, tuple]] = OrderedDict()
+        self._seq = itertools.count()
+        self._wakeup = asyncio.Event()
+        self._task: asyncio.Task | None = None
+
+    def publish(self, method: str, *args, coalesce_key: str | None = None) -> None:
+        key = (method, coalesce_key if coalesce_key else next(self._seq))
+        if key in self._pending:
+            self.metrics.states_coalesced += 1
+        self._pending[key] = (method, args)
+        if len(self._pending) > self.maxsize:
+            dropped, _ = self._pending.popitem(last=False)
+            self.metrics.events_dropped += 1
+            _LOGGER.warning(
+                "Listener %s is lagging, dropped %s", self.listener, dropped
+            )
+        self._wakeup.set()
+        if self._task is None:
+            self._task = asyncio.get_running_loop().create_task(
+                self._run(), name=f"Anova Oven listener {self.listener}"
+            )
+
+    def stop(self) -> None:
+        if self._task:
+            self._task.cancel()
+            self._task = None
+        self._pending.clear()
+
+    async def _run(self) -> None:
+        while True:
+            await self._wakeup.wait()
+            self._wakeup.clear()
+            while self._pending:
+                _, (method, args) = self._pending.popitem(last=False)
+                start = time.perf_counter()
+                try:
+                    await getattr(self.listener, method)(*args)
+                except Exception:
+                    _LOGGER.exception("Listener %s failed on %s", self.listener, method)
+                self.metrics.dispatch.observe(time.perf_counter() - start)
+
 
 class AnovaOvenApi:
     """A class to handle communicating with the anova api to get devices"""
@@ -34,7 +132,10 @@ class AnovaOvenApi:
         access_token: str,
         refresh_token: str,
         existing_devices: list[AnovaPrecisionOven] | None = None,
-        unit_of_temperature: AnovaUnitOfTemperature = AnovaUnitOfTemperature.CELSIUS,
+        ws_url: str = WS_URL,
+        token_url: str = TOKEN_URL,
+        heartbeat: float = HEARTBEAT,
+        idle_timeout: float = IDLE_TIMEOUT,
     ) -> None:
         """Creates an anova api class"""
         self.devices = {d.cooker_id: d for d in existing_devices or []}
@@ -43,238 +144,219 @@ class AnovaOvenApi:
         self.access_token: str = access_token
         self.refresh_token: str = refresh_token
         self._shold_stop = False
-        self._listeners: list[AnovaOvenUpdateListener] = []
+        self._listeners: list[ListenerDispatcher] = []
         self._ws: ClientWebSocketResponse | None = None
-        self._response_fut: asyncio.Future | None
-        self.unit_of_temperature = unit_of_temperature
+        # request_id -> future of the RESPONSE payload for in-flight commands.
+        self._pending: dict[str, asyncio.Future] = {}
+        self._decoder = StateDecoder()
+        self._targets: dict[str, TargetTracker] = {}
+        # Set once the first device list or state arrived.
+        self._ready = asyncio.Event()
+        self._devices_listed = asyncio.Event()
+        self.metrics = ApiMetrics()
+        self.ws_url = ws_url
+        self.token_url = token_url
+        self.heartbeat = heartbeat
+        self.idle_timeout = idle_timeout
 
     def add_listener(self, listener: "AnovaOvenUpdateListener"):
-        self._listeners.append(listener)
+        self._listeners.append(ListenerDispatcher(listener, metrics=self.metrics))
+
+    def remove_listener(self, listener: "AnovaOvenUpdateListener"):
+        for dispatcher in self._listeners:
+            if dispatcher.listener is listener:
+                dispatcher.stop()
+                self._listeners.remove(dispatcher)
+                break
+
+    def add_devices(
+        self, devices: list[AnovaPrecisionOven]
+    ) -> list[AnovaPrecisionOven]:
+        """Track known devices, return the instances the api already tracks."""
+        return [self.devices.setdefault(d.cooker_id, d) for d in devices]
+
+    def _publish(self, method: str, *args, coalesce_key: str | None = None) -> None:
+        for dispatcher in self._listeners:
+            dispatcher.publish(method, *args, coalesce_key=coalesce_key)
 
     async def run(self):
+        """Keep the websocket connected until stopped.
+
+        Reconnects with capped exponential backoff and jitter. The access token
+        is refreshed ahead of its expiry, or once when a connection is rejected
+        before any message arrived. Only a refresh token rejected by the token
+        endpoint stops the loop with InvalidAuth.
+        """
         self._shold_stop = False
+        try:
+            await self._supervise()
+        finally:
+            for dispatcher in self._listeners:
+                dispatcher.stop()
 
-        attempt = 0
+    async def _supervise(self):
+        backoff = Backoff()
+        fresh_token = False
 
         while not self._shold_stop:
-            url = f"https://devices.anovaculinary.io/?token={self.access_token}&supportedAccessories=APO&platform={PLATFORM}"
-            headers = {
-                "Sec-WebSocket-Protocol": "ANOVA_V2",
-                "Sec-WebSocket-Version": "13",
-            }
-            async with self.session.ws_connect(url, headers=headers) as ws:
-                self._ws = ws
-                target: Target = None
+            if token_expires_in(self.access_token) < TOKEN_REFRESH_MARGIN:
+                fresh_token = await self._try_renew_token()
+
+            received = rejected = False
+            if self.metrics.connects:
+                self.metrics.reconnects += 1
+            self.metrics.connects += 1
+            try:
+                received = await self._connect()
+                rejected = not received
+            except aiohttp.WSServerHandshakeError as err:
+                _LOGGER.warning("WS handshake failed: %s", err)
+                rejected = err.status in (401, 403)
+            except (aiohttp.ClientError, OSError) as err:
+                _LOGGER.warning("WS connection failed: %s", err)
+            finally:
+                self._ws = None
+                self._fail_pending(AnovaOffline("Websocket stream closed"))
+            _LOGGER.info("WS stream closed.")
+
+            if self._shold_stop:
+                break
+            if received:
+                backoff.reset()
+                fresh_token = False
+            elif rejected and not fresh_token:
+                fresh_token = await self._try_renew_token()
+            delay = backoff.next()
+            _LOGGER.debug("Reconnecting in %.1fs", delay)
+            await asyncio.sleep(delay)
+
+    async def _try_renew_token(self) -> bool:
+        try:
+            await self.renew_token()
+        except AnovaOffline as err:
+            _LOGGER.warning("Failed renew token: %s", err)
+            return False
+        return True
+
+    def _ws_connect(self):
+        url = f"{self.ws_url}?token={self.access_token}&supportedAccessories=APO&platform={PLATFORM}"
+        headers = {
+            "Sec-WebSocket-Protocol": "ANOVA_V2",
+            "Sec-WebSocket-Version": "13",
+        }
+        return self.session.ws_connect(
+            url,
+            headers=headers,
+            heartbeat=self.heartbeat,
+            receive_timeout=self.idle_timeout,
+        )
+
+    async def _connect(self) -> bool:
+        """Read one websocket connection, return if any message was received."""
+        received = False
+        async with self._ws_connect() as ws:
+            self._ws = ws
+            try:
                 async for msg in ws:
-                    attempt = 0
+                    received = True
                     if self._shold_stop:
                         break
-                    try:
-                        _LOGGER.debug("Found message %s", msg)
-                        match msg.type:
-                            case aiohttp.WSMsgType.TEXT:
-                                data = json.loads(msg.data)
-                                match data.get("command"):
-                                    case "EVENT_APO_STATE":
-                                        payload = data["payload"]
-                                        state = payload["state"]
-                                        nodes = state["nodes"]
-                                        bulbs = nodes["temperatureBulbs"]
-                                        he = nodes["heatingElements"]
-                                        sg = nodes["steamGenerators"]
-                                        hum = (
-                                            sg["relativeHumidity"]
-                                            if sg["mode"] == "idle"
-                                            else sg[
-                                                snake_case_to_camel_case(sg["mode"])
-                                            ]
-                                        )
-                                        cook = state.get("cook", {})
-                                        timer = nodes.get("timer", {})
-                                        tp = nodes.get("temperatureProbe")
-                                        raw_stages = json.dumps(cook.get("stages", []))
-
-                                        active_stage_index = None
-                                        for idx, s in enumerate(
-                                            (s for s in cook.get("stages", [])), start=1
-                                        ):
-                                            if s["id"] == cook.get("activeStageId"):
-                                                active_stage_index = idx
-                                                break
-                                        state = APOState(
-                                            sensor=APOSensor(
-                                                mode=state["state"]["mode"],
-                                                firmware_version=state["systemInfo"][
-                                                    "firmwareVersion"
-                                                ],
-                                                nodes=APOSensor.Nodes(
-                                                    cook=APOSensor.Nodes.Cook(
-                                                        seconds_elapsed=cook.get(
-                                                            "secondsElapsed", 0
-                                                        )
-                                                    ),
-                                                    temperature_probe=APOSensor.Nodes.TemperatureProbe(
-                                                        temperature=Temperature(
-                                                            celsius=tp["current"][
-                                                                "celsius"
-                                                            ],
-                                                            fahrenheit=tp["current"][
-                                                                "fahrenheit"
-                                                            ],
-                                                        )
-                                                        if "current" in tp
-                                                        else None,
-                                                        target_temperature=Temperature(
-                                                            celsius=tp["setpoint"][
-                                                                "celsius"
-                                                            ],
-                                                            fahrenheit=tp["setpoint"][
-                                                                "fahrenheit"
-                                                            ],
-                                                        )
-                                                        if "setpoint" in tp
-                                                        else None,
-                                                    )
-                                                    if tp
-                                                    else None,
-                                                    temperature_bulbs=APOSensor.Nodes.TemperatureBulbs(
-                                                        mode=bulbs["mode"],
-                                                        temperature=Temperature(
-                                                            celsius=bulbs[
-                                                                bulbs["mode"]
-                                                            ]["current"]["celsius"],
-                                                            fahrenheit=bulbs[
-                                                                bulbs["mode"]
-                                                            ]["current"]["fahrenheit"],
-                                                        ),
-                                                        target_temperature=Temperature(
-                                                            celsius=bulbs[
-                                                                bulbs["mode"]
-                                                            ]["setpoint"]["celsius"],
-                                                            fahrenheit=bulbs[
-                                                                bulbs["mode"]
-                                                            ]["setpoint"]["fahrenheit"],
-                                                        ),
-                                                        dosed=bulbs["wet"]["dosed"],
-                                                        dose_failed=bulbs["wet"][
-                                                            "doseFailed"
-                                                        ],
-                                                    ),
-                                                    rear_heating=APOSensor.Nodes.HeatingElement(
-                                                        watts=he["rear"]["watts"],
-                                                        on=he["rear"]["on"],
-                                                    ),
-                                                    bottom_heating=APOSensor.Nodes.HeatingElement(
-                                                        watts=he["bottom"]["watts"],
-                                                        on=he["bottom"]["on"],
-                                                    ),
-                                                    top_heating=APOSensor.Nodes.HeatingElement(
-                                                        watts=he["top"]["watts"],
-                                                        on=he["top"]["on"],
-                                                    ),
-                                                    steam_generator=APOSensor.Nodes.SteamGenerator(
-                                                        mode=sg["mode"],
-                                                        relative_humidity=hum.get(
-                                                            "current"
-                                                        ),
-                                                        target_humidity=hum.get(
-                                                            "setpoint", 0
-                                                        ),
-                                                    ),
-                                                    timer=APOSensor.Nodes.Timer(
-                                                        mode=timer.get("mode"),
-                                                        initial=timer.get("initial"),
-                                                        current=timer.get("current"),
-                                                    ),
-                                                    lamp_on=nodes["lamp"]["on"],
-                                                    door_closed=nodes["door"]["closed"],
-                                                    water_tank_empty=nodes["waterTank"][
-                                                        "empty"
-                                                    ],
-                                                    fan_speed=nodes["fan"]["speed"],
-                                                ),
-                                            ),
-                                            stages=APOState.Stages(
-                                                active=active_stage_index,
-                                                count=len(cook.get("stages", [])),
-                                            ),
-                                            raw_stages=raw_stages,
-                                        )
-                                        device_id = payload["cookerId"]
-                                        device = self.devices[device_id]
-                                        device.state = state
-                                        for listener in self._listeners:
-                                            await listener.on_state(device, state)
-
-                                        current_target: Target | None = None
-                                        if (
-                                            state.sensor.nodes.temperature_probe
-                                            and state.sensor.nodes.temperature_probe.target_temperature
-                                        ):
-                                            current_target = ProbeTarget(
-                                                temperature=state.sensor.nodes.temperature_probe.temperature,
-                                                target_temperature=state.sensor.nodes.temperature_probe.target_temperature,
-                                            )
-                                        elif (
-                                            state.sensor.nodes.timer
-                                            and state.sensor.nodes.timer.initial
-                                        ):
-                                            current_target = TimerTarget(
-                                                current=state.sensor.nodes.timer.current,
-                                                initial=state.sensor.nodes.timer.initial,
-                                            )
-                                        if target != current_target and (
-                                            (current_target and current_target.reached)
-                                            or current_target is None
-                                        ):
-                                            for listener in self._listeners:
-                                                await listener.on_target_reached(
-                                                    device, target
-                                                )
-                                        target = current_target
-                                    case "EVENT_APO_WIFI_LIST":
-                                        payload = data.get("payload")
-                                        new_devices: list[tuple[str, str]] = [
-                                            (d["cookerId"], d["type"])
-                                            for d in payload
-                                            if d["cookerId"] not in self.devices
-                                        ]
-                                        for device in new_devices:
-                                            _LOGGER.debug("Found device %s", device[0])
-                                            oven = AnovaPrecisionOven(
-                                                cooker_id=device[0],
-                                                type=device[1],
-                                            )
-                                            self.devices[device[0]] = oven
-                                            for listener in self._listeners:
-                                                await listener.on_new_device(oven)
-
-                                    case "RESPONSE":
-                                        if self._response_fut:
-                                            payload = data.get("payload")
-                                            self._response_fut.set_result(payload)
-                                    case _:
-                                        pass
-                            case aiohttp.WSMsgType.CLOSE:
-                                break
-                            case aiohttp.WSMsgType.ERROR:
-                                break
-                            case _:
-                                _LOGGER.debug(f"Unknown message type: {msg}")
-                        await asyncio.sleep(0)
-                    except Exception as err:
-                        _LOGGER.exception("Failed processing msg {msg}: {err}")
-                        self._ws = None
-                        raise err
-            _LOGGER.info("WS stream closed.")
-            if attempt > 0:
-                raise InvalidAuth("Access Token invalid")
+                    match msg.type:
+                        case aiohttp.WSMsgType.TEXT:
+                            self.metrics.frames_received += 1
+                            command = sniff_command(msg.data)
+                            if command is None or command in HANDLED_COMMANDS:
+                                await self._on_frame(msg.data)
+                        case aiohttp.WSMsgType.CLOSE | aiohttp.WSMsgType.ERROR:
+                            break
+                        case _:
+                            _LOGGER.debug(f"Unknown message type: {msg}")
+                    await asyncio.sleep(0)
+            except TimeoutError:
+                _LOGGER.info("No message for %ss, reconnecting", self.idle_timeout)
+        return received
+
+    async def _on_frame(self, frame: str):
+        try:
+            data = loads(frame)
+        except ValueError as err:
+            self.metrics.frames_failed += 1
+            _LOGGER.warning("Dropped malformed frame %s: %s", frame, err)
+            return
+        await self._on_message(data)
+
+    def _add_device(self, cooker_id: str, device_type: str) -> AnovaPrecisionOven:
+        _LOGGER.debug("Found device %s", cooker_id)
+        oven = self.devices[cooker_id] = AnovaPrecisionOven(
+            cooker_id=cooker_id,
+            type=device_type,
+        )
+        self._publish("on_new_device", oven)
+        return oven
+
+    async def _on_message(self, data: dict):
+        """Process a message, a message that fails is logged and dropped."""
+        _LOGGER.debug("Found message %s", data)
+        try:
+            match data.get("command"):
+                case "EVENT_APO_STATE":
+                    self._ready.set()
+                    payload = data["payload"]
+                    cooker_id = payload["cookerId"]
+                    # A state may come before the device list names its oven.
+                    if (device := self.devices.get(cooker_id)) is None:
+                        device = self._add_device(cooker_id, payload.get("type"))
+                    start = time.perf_counter()
+                    state = self._decoder.decode(
+                        device.cooker_id,
+                        payload["state"],
+                        device.state,
+                    )
+                    self.metrics.decode.observe(time.perf_counter() - start)
+                    self.metrics.frames_decoded += 1
+                    device.state = state
+                    device.raw_state = payload["state"]
+                    self._publish(
+                        "on_state", device, state, coalesce_key=device.cooker_id
+                    )
 
-            if not self._shold_stop:
-                await self.renew_token()
-                await asyncio.sleep(1)
-            attempt += 1
-        self._ws = None
+                    if (tracker := self._targets.get(device.cooker_id)) is None:
+                        tracker = self._targets[device.cooker_id] = TargetTracker()
+                    target = cook_target(state)
+                    if tracker.update(target):
+                        self._publish("on_target_reached", device, target)
+                case "EVENT_APO_WIFI_LIST":
+                    self._ready.set()
+                    payload = data.get("payload")
+                    for d in payload:
+                        if d["cookerId"] not in self.devices:
+                            self._add_device(d["cookerId"], d["type"])
+                    self._devices_listed.set()
+
+                case "RESPONSE":
+                    fut = self._pending.get(data.get("requestId"))
+                    if fut and not fut.done():
+                        fut.set_result(data.get("payload"))
+                case _:
+                    pass
+        except Exception as err:
+            self.metrics.frames_failed += 1
+            _LOGGER.exception(f"Failed processing msg {data}: {err}")
+
+    async def wait_ready(self, timeout: float) -> bool:
+        """Wait for the first device list or state, return False on timeout."""
+        try:
+            async with asyncio.timeout(timeout):
+                await self._ready.wait()
+        except TimeoutError:
+            return False
+        return True
+
+    def restore_state(self, device: AnovaPrecisionOven, raw_state: dict) -> APOState:
+        """Decode a previously stored state payload into the device."""
+        device.state = self._decoder.decode(device.cooker_id, raw_state, device.state)
+        device.raw_state = raw_state
+        return device.state
 
     async def stop(self):
         self._shold_stop = True
@@ -282,44 +364,140 @@ class AnovaOvenApi:
             await self._ws.close()
 
     async def renew_token(self):
-        url = f"https://securetoken.googleapis.com/v1/token?key={self.app_key}"
+        """Refresh the access token.
+
+        Raises InvalidAuth only when the token endpoint rejects the refresh
+        token, any other failure is AnovaOffline and can be retried.
+        """
+        url = f"{self.token_url}?key={self.app_key}"
         data = {"grant_type": "refresh_token", "refresh_token": self.refresh_token}
         try:
             async with self.session.post(url, data=data) as resp:
+                if resp.status == HTTPStatus.BAD_REQUEST:
+                    res = await resp.json(content_type=None)
+                    if isinstance(res, dict) and "error" in res:
+                        raise InvalidAuth(res["error"])
+                resp.raise_for_status()
                 res = await resp.json()
-                if "error" in res:
-                    raise InvalidAuth(res)
                 self.access_token = res["access_token"]
                 self.refresh_token = res["refresh_token"]
+        except aiohttp.ClientResponseError as err:
+            raise AnovaOffline(
+                f"Token endpoint failed: {err.status} {err.message}"
+            ) from err
+        except (aiohttp.ClientError, TimeoutError) as err:
+            raise AnovaOffline(f"Token endpoint unreachable: {err}") from err
+        except (ValueError, KeyError) as err:
+            raise AnovaOffline(f"Unexpected token endpoint response: {err}") from err
 
-                _LOGGER.info("Token refreshed.")
+        _LOGGER.info("Token refreshed.")
+        self.metrics.token_refreshes += 1
 
-                for listener in self._listeners:
-                    await listener.on_new_token(self.access_token, self.refresh_token)
-        except Exception as err:
-            _LOGGER.exception(f"Failed renew token: {err}")
-            raise InvalidAuth("Access Token invalid")
-
-    async def get_devices(self) -> list[AnovaPrecisionOven]:
-        timeout = time.time() + 5.5  # 5 seconds from now
-        while time.time() < timeout:
-            if self.devices:
-                return list(self.devices.values())
-            await asyncio.sleep(1)
-        raise NoDevicesFound("Found no devices on the websocket")
-
-    async def send_command(self, command: APOCommand):
-        if self._ws:
-            data = dict_keys_to_camel_case(to_dict(command))
-            _LOGGER.info(json.dumps(data))
-            self._response_fut = asyncio.Future()
-            await self._ws.send_json(data)
+        self._publish("on_new_token", self.access_token, self.refresh_token)
+
+    async def get_devices(
+        self, timeout: float = DISCOVERY_TIMEOUT
+    ) -> list[AnovaPrecisionOven]:
+        """Return the known devices, waiting for the device list if there are none.
+
+        Requires run() to be reading the websocket.
+        """
+        if not self.devices:
             try:
-                res = await asyncio.wait_for(self._response_fut, timeout=10)
-            finally:
-                self._response_fut = None
-            if res and res.get("status") == "error":
-                raise CommandError(res.get("error", "Unknown error"))
+                async with asyncio.timeout(timeout):
+                    await self._devices_listed.wait()
+            except TimeoutError:
+                pass
+        if not self.devices:
+            raise NoDevicesFound("Found no devices on the websocket")
+        return list(self.devices.values())
+
+    async def discover(
+        self, timeout: float = DISCOVERY_TIMEOUT
+    ) -> list[AnovaPrecisionOven]:
+        """Connect, read the device list and disconnect.
+
+        The access token is refreshed once if the connection is rejected.
+        """
+        if token_expires_in(self.access_token) < TOKEN_REFRESH_MARGIN:
+            await self.renew_token()
+        try:
+            async with asyncio.timeout(timeout):
+                for attempt in range(2):
+                    try:
+                        if await self._read_device_list():
+                            break
+                    except aiohttp.WSServerHandshakeError as err:
+                        if err.status not in (401, 403):
+                            raise AnovaOffline(f"WS handshake failed: {err}") from err
+                    except aiohttp.ClientError as err:
+                        raise AnovaOffline(f"WS connection failed: {err}") from err
+                    if attempt:
+                        raise InvalidAuth("Websocket connection rejected")
+                    await self.renew_token()
+        except TimeoutError:
+            pass
+        if not self.devices:
+            raise NoDevicesFound("Found no devices on the websocket")
+        return list(self.devices.values())
+
+    async def _read_device_list(self) -> bool:
+        """Read one connection until the device list, return if it arrived."""
+        async with self._ws_connect() as ws:
+            async for msg in ws:
+                if msg.type != aiohttp.WSMsgType.TEXT:
+                    break
+                if sniff_command(msg.data) not in (None, "EVENT_APO_WIFI_LIST"):
+                    continue
+                try:
+                    data = loads(msg.data)
+                except ValueError as err:
+                    self.metrics.frames_failed += 1
+                    _LOGGER.warning("Dropped malformed frame %s: %s", msg.data, err)
+                    continue
+                if data.get("command") == "EVENT_APO_WIFI_LIST":
+                    await self._on_message(data)
+                    return True
+        return False
+
+    async def send_command(self, command: APOCommand, timeout: float = COMMAND_TIMEOUT):
+        """Send a command and wait for the RESPONSE with the same request id.
+
+        Several commands can be in flight at once, each one has its own timeout.
+        """
+        await self.send_message(to_camel_case_dict(command), timeout)
+
+    async def send_message(self, message: dict, timeout: float = COMMAND_TIMEOUT):
+        """Send an already serialized command, see send_command."""
+        if not self._ws:
+            raise AnovaOffline("Websocket is not connected")
+        request_id = message["requestId"]
+        data = dumps(message)
+        _LOGGER.info(data)
+        fut = asyncio.get_running_loop().create_future()
+        self._pending[request_id] = fut
+        self.metrics.commands += 1
+        start = time.perf_counter()
+        try:
+            try:
+                await self._ws.send_str(data)
+            except (ConnectionResetError, aiohttp.ClientError) as err:
+                raise AnovaOffline(f"Websocket send failed: {err}") from err
+            res = await asyncio.wait_for(fut, timeout=timeout)
+        except Exception:
+            self.metrics.command_errors += 1
+            raise
+        finally:
+            self._pending.pop(request_id, None)
+        self.metrics.command_round_trip.observe(time.perf_counter() - start)
+        if res and res.get("status") == "error":
+            self.metrics.command_errors += 1
+            raise CommandError(res.get("error", "Unknown error"))
+
+    def _fail_pending(self, err: Exception) -> None:
+        for fut in self._pending.values():
+            if not fut.done():
+                fut.set_exception(err)
 
 
 class AnovaOvenUpdateListener(ABC):
@@ -3,7 +3,7 @@
 from __future__ import annotations
 
 from collections.abc import Callable
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from enum import StrEnum, auto
 
 from homeassistant import config_entries
@@ -11,12 +11,13 @@ from homeassistant.components.sensor import (
     SensorEntity,
     SensorEntityDescription,
 )
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.dispatcher import async_dispatcher_connect
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.helpers.typing import StateType
 
-from .const import DOMAIN
-from .coordinator import AnovaCoordinator
+from .const import ATTR_STALE, DOMAIN, SIGNAL_NEW_DEVICE
+from .coordinator import AnovaCoordinator, AnovaDeviceCoordinator
 from .entity import AnovaOvenDescriptionEntity
 from .precision_oven import APOSensor
 
@@ -32,6 +33,8 @@ class AnovaOvenBinarySensorEntityDescriptionMixin:
 
     format_type: FormatType
     value_fn: Callable[[APOSensor], bool]
+    # STATE_KEYS the value depends on, empty means any change.
+    state_keys: tuple[str, ...] = field(default_factory=tuple)
 
 
 @dataclass(frozen=True)
@@ -44,24 +47,28 @@ class AnovaOvenBinarySensorEntityDescription(
 SENSOR_DESCRIPTIONS: list[SensorEntityDescription] = [
     AnovaOvenBinarySensorEntityDescription(
         key="sous_vide",
+        state_keys=("temperature_bulbs",),
         translation_key="sous_vide",
         format_type=FormatType.OnOff,
         value_fn=lambda data: data.sensor.nodes.temperature_bulbs.mode == "wet",
     ),
     AnovaOvenBinarySensorEntityDescription(
         key="lamp_on",
+        state_keys=("lamp_on",),
         translation_key="lamp_on",
         format_type=FormatType.OnOff,
         value_fn=lambda data: data.sensor.nodes.lamp_on,
     ),
     AnovaOvenBinarySensorEntityDescription(
         key="door_closed",
+        state_keys=("door_closed",),
         translation_key="door_closed",
         format_type=FormatType.YesNo,
         value_fn=lambda data: data.sensor.nodes.door_closed,
     ),
     AnovaOvenBinarySensorEntityDescription(
         key="water_tank_empty",
+        state_keys=("water_tank_empty",),
         translation_key="water_tank_empty",
         format_type=FormatType.YesNo,
         value_fn=lambda data: data.sensor.nodes.water_tank_empty,
@@ -76,10 +83,20 @@ async def async_setup_entry(
 ) -> None:
     """Set up Anova device."""
     coordinator: AnovaCoordinator = hass.data[DOMAIN][entry.entry_id]
-    async_add_entities(
-        AnovaOvenBinarySensor(device[0], coordinator, description)
-        for device in coordinator.devices.items()
-        for description in SENSOR_DESCRIPTIONS
+
+    @callback
+    def async_add_device(device_coordinator: AnovaDeviceCoordinator) -> None:
+        async_add_entities(
+            AnovaOvenBinarySensor(device_coordinator, description)
+            for description in SENSOR_DESCRIPTIONS
+        )
+
+    for device_coordinator in coordinator.coordinators.values():
+        async_add_device(device_coordinator)
+    entry.async_on_unload(
+        async_dispatcher_connect(
+            hass, SIGNAL_NEW_DEVICE.format(entry.entry_id), async_add_device
+        )
     )
 
 
@@ -91,7 +108,7 @@ class AnovaOvenBinarySensor(AnovaOvenDescriptionEntity, SensorEntity):
     @property
     def native_value(self) -> StateType:
         """Return the state."""
-        if state := self.coordinator.devices[self.cooker_id].state:
+        if state := self.coordinator.device.state:
             is_on = self.entity_description.value_fn(state)
             match self.entity_description.format_type:
                 case FormatType.OnOff:
@@ -99,3 +116,8 @@ class AnovaOvenBinarySensor(AnovaOvenDescriptionEntity, SensorEntity):
                 case FormatType.YesNo:
                     return "yes" if is_on else "no"
         return None
+
+    @property
+    def extra_state_attributes(self) -> dict[str, bool]:
+        """Return if the state is the restored one, not yet live."""
+        return {ATTR_STALE: self.coordinator.stale}
@@ -0,0 +1,40 @@
+"""JSON encoding for websocket frames, backed by orjson when it is installed."""
+
+from __future__ import annotations
+
+import json
+import re
+from collections.abc import Callable
+from typing import Any
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None
+
+loads: Callable[[str | bytes], Any]
+dumps: Callable[[Any], str]
+
+if orjson is not None:
+    loads = orjson.loads
+
+    def dumps(obj: Any) -> str:
+        return orjson.dumps(obj).decode()
+
+else:  # pragma: no cover
+    loads = json.loads
+
+    def dumps(obj: Any) -> str:
+        return json.dumps(obj, separators=(",", ":"))
+
+
+# The server writes "command" first, only a short prefix is searched so a
+# "command" key nested in a payload is never picked up.
+_COMMAND_RE = re.compile(r'^\s*\{\s*"command"\s*:\s*"([^"]*)"')
+
+
+def sniff_command(frame: str) -> str | None:
+    """Return the command of a frame without parsing it, None if unsure."""
+    if match := _COMMAND_RE.match(frame):
+        return match.group(1)
+    return None
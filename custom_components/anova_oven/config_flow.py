@@ -2,8 +2,8 @@
 
 from __future__ import annotations
 
-import asyncio
 import logging
+from collections.abc import Mapping
 from typing import Any
 
 import voluptuous as vol
@@ -18,9 +18,18 @@ from homeassistant.data_entry_flow import FlowResult
 from homeassistant.helpers.aiohttp_client import async_get_clientsession
 
 from .api import AnovaOvenApi
+from .connection import account_key
 from .const import CONF_APP_KEY, CONF_REFRESH_TOKEN, DOMAIN, AnovaUnitOfTemperature
-from .exceptions import InvalidAuth, NoDevicesFound
+from .exceptions import AnovaOffline, InvalidAuth, NoDevicesFound
 from .precision_oven import AnovaPrecisionOven
+from .update_policy import (
+    CHANNELS,
+    DEFAULT_VALUES,
+    IMMEDIATE,
+    POLICIES,
+    policy_option,
+    value_option,
+)
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -37,13 +46,32 @@ STEP_USER_DATA_SCHEMA = vol.Schema(
     }
 )
 
-STEP_OPTIONS_SCHEMA = vol.Schema(
+STEP_REAUTH_DATA_SCHEMA = vol.Schema(
     {
+        vol.Required(CONF_ACCESS_TOKEN): str,
+        vol.Required(CONF_REFRESH_TOKEN): str,
+    }
+)
+
+
+def options_schema(options: Mapping[str, Any]) -> vol.Schema:
+    """Return the options schema, defaulting to the current ``options``."""
+    schema = {
         vol.Optional(
-            CONF_TEMPERATURE_UNIT, default=AnovaUnitOfTemperature.CELSIUS
+            CONF_TEMPERATURE_UNIT,
+            default=options.get(CONF_TEMPERATURE_UNIT, AnovaUnitOfTemperature.CELSIUS),
         ): vol.All(vol.Coerce(str), vol.In([e.value for e in AnovaUnitOfTemperature])),
     }
-)
+    for channel in CHANNELS:
+        policy = policy_option(channel)
+        value = value_option(channel)
+        default_policy = options.get(policy, IMMEDIATE)
+        default_value = options.get(value, DEFAULT_VALUES[channel])
+        schema[vol.Optional(policy, default=default_policy)] = vol.In(POLICIES)
+        schema[vol.Optional(value, default=default_value)] = vol.All(
+            vol.Coerce(float), vol.Range(min=0)
+        )
+    return vol.Schema(schema)
 
 
 async def validate_input(hass: HomeAssistant, data: dict[str, Any]) -> dict[str, Any]:
@@ -65,13 +93,7 @@ async def validate_input(hass: HomeAssistant, data: dict[str, Any]) -> dict[str,
         access_token=data[CONF_ACCESS_TOKEN],
         refresh_token=data[CONF_REFRESH_TOKEN],
     )
-
-    devices = []
-    async with asyncio.TaskGroup() as tg:
-        tg.create_task(api.run())
-        devices = await api.get_devices()
-        await api.stop()
-    return devices
+    return await api.discover()
 
 
 class ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
@@ -79,22 +101,40 @@ class ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
 
     VERSION = 1
 
+    _reauth_entry: config_entries.ConfigEntry | None = None
+
+    async def _async_validate(
+        self, data: dict[str, Any], errors: dict[str, str]
+    ) -> list[AnovaPrecisionOven] | None:
+        """Return the devices of ``data``, None with ``errors`` set on failure."""
+        try:
+            return await validate_input(self.hass, data)
+        except AnovaOffline:
+            errors["base"] = "cannot_connect"
+        except InvalidAuth:
+            errors["base"] = "invalid_auth"
+        except NoDevicesFound:
+            errors["base"] = "no_devices_found"
+        except Exception:  # pylint: disable=broad-except
+            _LOGGER.exception("Unexpected exception")
+            errors["base"] = "unknown"
+        return None
+
     async def async_step_user(
         self, user_input: dict[str, Any] | None = None
     ) -> FlowResult:
         """Handle the initial step."""
         errors: dict[str, str] = {}
         if user_input is not None:
-            try:
-                devices = await validate_input(self.hass, user_input)
-            except InvalidAuth:
-                errors["base"] = "invalid_auth"
-            except NoDevicesFound:
-                errors["base"] = "no_devices_found"
-            except Exception:  # pylint: disable=broad-except
-                _LOGGER.exception("Unexpected exception")
-                errors["base"] = "unknown"
-            else:
+            key = account_key(user_input)
+            await self.async_set_unique_id(key)
+            self._abort_if_unique_id_configured()
+            # Entries set up before the unique id was stored.
+            for entry in self._async_current_entries(include_ignore=False):
+                if account_key(entry.data) == key:
+                    return self.async_abort(reason="already_configured")
+            devices = await self._async_validate(user_input, errors)
+            if devices is not None:
                 # We store device list in config flow in order to persist found devices on restart, as the Anova api get_devices does not return any devices that are offline.
                 device_list = serialize_device_list(devices)
                 return self.async_create_entry(
@@ -114,6 +154,29 @@ class ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
             step_id="user", data_schema=STEP_USER_DATA_SCHEMA, errors=errors
         )
 
+    async def async_step_reauth(self, entry_data: Mapping[str, Any]) -> FlowResult:
+        """Ask for new tokens after the refresh token was rejected."""
+        self._reauth_entry = self.hass.config_entries.async_get_entry(
+            self.context["entry_id"]
+        )
+        return await self.async_step_reauth_confirm()
+
+    async def async_step_reauth_confirm(
+        self, user_input: dict[str, Any] | None = None
+    ) -> FlowResult:
+        """Validate the new tokens and reload the entry."""
+        errors: dict[str, str] = {}
+        if user_input is not None:
+            data = {**self._reauth_entry.data, **user_input}
+            if await self._async_validate(data, errors) is not None:
+                return self.async_update_reload_and_abort(self._reauth_entry, data=data)
+
+        return self.async_show_form(
+            step_id="reauth_confirm",
+            data_schema=STEP_REAUTH_DATA_SCHEMA,
+            errors=errors,
+        )
+
     @staticmethod
     @callback
     def async_get_options_flow(
@@ -134,9 +197,7 @@ class AnovaOvenOptionsFlowHandler(config_entries.OptionsFlowWithConfigEntry):
 
         return self.async_show_form(
             step_id="init",
-            data_schema=self.add_suggested_values_to_schema(
-                STEP_OPTIONS_SCHEMA, self.config_entry.options
-            ),
+            data_schema=options_schema(self.config_entry.options),
         )
 
 
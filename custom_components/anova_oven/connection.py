@@ -0,0 +1,120 @@
+"""Websocket connections shared by the config entries of one Anova account."""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+from collections.abc import Callable, Mapping
+from typing import Any
+
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import CONF_ACCESS_TOKEN
+from homeassistant.core import HomeAssistant, callback
+
+from .api import AnovaOvenApi
+from .const import CONF_REFRESH_TOKEN, DOMAIN
+from .exceptions import InvalidAuth
+from .util import token_user_id
+
+_LOGGER = logging.getLogger(__name__)
+
+DATA_CONNECTIONS = f"{DOMAIN}_connections"
+
+
+class AnovaConnection:
+    """One api and websocket shared by every config entry of an account."""
+
+    def __init__(self, hass: HomeAssistant, key: str, api: AnovaOvenApi) -> None:
+        self.hass = hass
+        self.key = key
+        self.api = api
+        self.entry_ids: set[str] = set()
+        self._task: asyncio.Task | None = None
+        self._stop_listeners: list[Callable[[Exception], None]] = []
+
+    @property
+    def stopped(self) -> bool:
+        """Whether the reader ran and has stopped."""
+        return self._task is not None and self._task.done()
+
+    @callback
+    def async_start(self) -> None:
+        """Start reading the websocket unless it already runs.
+
+        A connection whose reader stopped, e.g. on a rejected refresh token, is
+        started again.
+        """
+        if self._task is None or self.stopped:
+            self._task = self.hass.async_create_background_task(
+                self._async_run(), name="Anova Oven WS Task"
+            )
+
+    @callback
+    def async_add_stop_listener(
+        self, stop_listener: Callable[[Exception], None]
+    ) -> Callable[[], None]:
+        """Call ``stop_listener`` with the error the reader stopped on."""
+        self._stop_listeners.append(stop_listener)
+
+        @callback
+        def remove_stop_listener() -> None:
+            self._stop_listeners.remove(stop_listener)
+
+        return remove_stop_listener
+
+    async def _async_run(self) -> None:
+        try:
+            await self.api.run()
+        except InvalidAuth as err:
+            _LOGGER.error("Anova refresh token was rejected: %s", err)
+            self._async_stopped(err)
+            for entry_id in self.entry_ids:
+                if entry := self.hass.config_entries.async_get_entry(entry_id):
+                    entry.async_start_reauth(self.hass)
+        except Exception as err:  # pylint: disable=broad-except
+            _LOGGER.exception("Anova websocket stopped")
+            self._async_stopped(err)
+
+    @callback
+    def _async_stopped(self, err: Exception) -> None:
+        for stop_listener in list(self._stop_listeners):
+            stop_listener(err)
+
+    async def async_release(self, entry_id: str) -> None:
+        """Drop a config entry, the connection closes with the last one."""
+        self.entry_ids.discard(entry_id)
+        if self.entry_ids:
+            return
+        self.hass.data[DATA_CONNECTIONS].pop(self.key, None)
+        await self.api.stop()
+        if self._task:
+            self._task.cancel()
+            self._task = None
+
+
+def account_key(data: Mapping[str, Any]) -> str:
+    """Identify the account of entry data by the user id of its token."""
+    user_id = token_user_id(data[CONF_ACCESS_TOKEN])
+    return user_id or data[CONF_REFRESH_TOKEN]
+
+
+@callback
+def async_get_connection(
+    hass: HomeAssistant,
+    entry: ConfigEntry,
+    api_factory: Callable[[], AnovaOvenApi],
+) -> AnovaConnection:
+    """Return the connection of the entry's account, created on first use."""
+    connections: dict[str, AnovaConnection] = hass.data.setdefault(DATA_CONNECTIONS, {})
+    key = account_key(entry.data)
+    if (connection := connections.get(key)) is None:
+        connection = connections[key] = AnovaConnection(hass, key, api_factory())
+    elif connection.stopped:
+        # A stopped connection retries with the entry's tokens, they may have
+        # been renewed by reauthentication.
+        connection.api.access_token = entry.data[CONF_ACCESS_TOKEN]
+        connection.api.refresh_token = entry.data[CONF_REFRESH_TOKEN]
+    elif connection.entry_ids - {entry.entry_id}:
+        _LOGGER.debug("Sharing the connection of entries %s", connection.entry_ids)
+    connection.entry_ids.add(entry.entry_id)
+    return connection
@@ -10,6 +10,23 @@ CONF_REFRESH_TOKEN = "refresh_token"
 
 EVENT_COOK_TARGET_REACHED = f"{DOMAIN}.cook_target_reached"
 
+# Formatted with the config entry id, sent with the new device coordinator.
+SIGNAL_NEW_DEVICE = f"{DOMAIN}_new_device_{{}}"
+# Refresh of the diagnostic metric sensors of a config entry.
+SIGNAL_METRICS = f"{DOMAIN}_metrics_{{}}"
+# Model of the service device holding the metric sensors of a config entry.
+CLOUD_MODEL = "Cloud connection"
+
+# Device registry id -> (cooker id, entry coordinator) of resolved devices.
+DATA_DEVICES = f"{DOMAIN}_devices"
+
+# Last known oven states, formatted with the config entry id.
+STORAGE_KEY = f"{DOMAIN}.{{}}"
+STORAGE_VERSION = 1
+
+# State attribute of the oven sensors, true while showing a restored state.
+ATTR_STALE = "stale"
+
 
 class AnovaUnitOfTemperature(StrEnum):
     """Temperature units."""
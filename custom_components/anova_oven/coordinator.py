@@ -1,44 +1,216 @@
 """Support for Anova Coordinators."""
 
 import logging
-from asyncio import Task, sleep
+import time
+from collections import defaultdict
+from collections.abc import Callable
+from datetime import datetime, timedelta
 
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import CONF_ACCESS_TOKEN
-from homeassistant.core import HomeAssistant, callback
+from homeassistant.core import CALLBACK_TYPE, Event, HomeAssistant, callback
 from homeassistant.helpers import device_registry
+from homeassistant.helpers.dispatcher import async_dispatcher_send
+from homeassistant.helpers.event import async_call_later, async_track_time_interval
+from homeassistant.helpers.storage import Store
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator
 
 from .api import AnovaOvenApi, AnovaOvenUpdateListener
-from .const import CONF_REFRESH_TOKEN, DOMAIN, EVENT_COOK_TARGET_REACHED
-from .precision_oven import AnovaPrecisionOven, APOState, Target
+from .connection import AnovaConnection
+from .const import (
+    CONF_REFRESH_TOKEN,
+    DATA_DEVICES,
+    DOMAIN,
+    EVENT_COOK_TARGET_REACHED,
+    SIGNAL_METRICS,
+    SIGNAL_NEW_DEVICE,
+    STORAGE_KEY,
+    STORAGE_VERSION,
+    AnovaUnitOfTemperature,
+)
+from .metrics import CoordinatorMetrics
+from .precision_oven import (
+    AnovaPrecisionOven,
+    APOState,
+    Target,
+    changed_state_keys,
+)
+from .session import SessionTracker
+from .telemetry import OvenTelemetry
+from .update_policy import UpdateFilter, UpdatePolicy
 
 _LOGGER = logging.getLogger(__name__)
 
+# Longest time setup waits for the first message from the cloud.
+READY_TIMEOUT = 5
+# Longest time state changes are batched before the last known states are saved.
+SAVE_DELAY = 60
+# Interval of the diagnostic metric sensors, they also refresh with no oven state.
+METRICS_INTERVAL = timedelta(seconds=60)
 
-class AnovaCoordinator(DataUpdateCoordinator[APOState], AnovaOvenUpdateListener):
-    """Anova custom coordinator."""
+
+class AnovaDeviceCoordinator(DataUpdateCoordinator[APOState]):
+    """Coordinator holding the state of a single Anova oven."""
 
     def __init__(
         self,
-        api: AnovaOvenApi,
         hass: HomeAssistant,
-        entry: ConfigEntry,
-        devices: list[AnovaPrecisionOven],
+        device: AnovaPrecisionOven,
+        metrics: CoordinatorMetrics | None = None,
+        update_filter: UpdateFilter | None = None,
     ) -> None:
-        """Set up Anova Coordinator."""
+        """Set up Anova device coordinator."""
         super().__init__(
             hass,
-            name="Anova Precision Oven",
+            name=f"Anova Precision Oven {device.cooker_id}",
             logger=_LOGGER,
         )
-        assert self.config_entry is not None
-        api.add_listener(self)
-        self.api: AnovaOvenApi = api
+        self.device = device
+        self.data = device.state
+        # True while data is a restored state and not yet confirmed by the oven.
+        self.stale = False
+        self.session = SessionTracker()
+        self.metrics = metrics or CoordinatorMetrics()
+        self.update_filter = update_filter or UpdateFilter({})
+        self._unsub_flush: CALLBACK_TYPE | None = None
+        # state key -> callbacks, key None means any change.
+        self._state_listeners: defaultdict[str | None, set[CALLBACK_TYPE]] = (
+            defaultdict(set)
+        )
+
+    @callback
+    def async_add_listener(
+        self, update_callback: CALLBACK_TYPE, context: object = None
+    ) -> Callable[[], None]:
+        """Listen for data updates.
+
+        Entities pass the state keys they read as context to be notified only
+        when one of those keys changes.
+        """
+        remove_listener = super().async_add_listener(update_callback, context)
+        keys = context if isinstance(context, tuple) and context else (None,)
+        for key in keys:
+            self._state_listeners[key].add(update_callback)
+
+        @callback
+        def remove_state_listener() -> None:
+            remove_listener()
+            for key in keys:
+                self._state_listeners[key].discard(update_callback)
+
+        return remove_state_listener
+
+    @callback
+    def async_set_state(self, state: APOState, stale: bool = False) -> None:
+        """Store a new state and notify listeners of the changed keys."""
+        changed = changed_state_keys(self.data, state)
+        self.data = state
+        was_stale, self.stale = self.stale, stale
+        now = time.monotonic()
+        # Pseudo key of the energy and cook session sensors.
+        if not stale and self.session.update(now, state):
+            changed.add("session")
+        if not self.last_update_success or was_stale != stale:
+            # Back from unavailable or from the restored state, every entity
+            # writes its state again.
+            self.last_update_success = True
+            self.async_update_listeners()
+            return
+        if not stale and self.update_filter:
+            changed = self._select(now, changed)
+        self._async_notify(changed)
+
+    @callback
+    def async_set_unavailable(self) -> None:
+        """Mark the oven unavailable until its next state."""
+        if self.last_update_success:
+            self.last_update_success = False
+            self.async_update_listeners()
+
+    def _select(self, now: float, changed: set[str]) -> set[str]:
+        """Apply the update policies, scheduling a flush of held back keys."""
+        publish, due = self.update_filter.select(now, self.data, changed)
+        if due is not None and self._unsub_flush is None:
+            self._unsub_flush = async_call_later(
+                self.hass, max(due - now, 0), self._async_flush
+            )
+        return publish
+
+    @callback
+    def _async_flush(self, _now: datetime) -> None:
+        self._unsub_flush = None
+        if self.data is not None:
+            self._async_notify(self._select(time.monotonic(), set()))
+
+    async def async_shutdown(self) -> None:
+        await super().async_shutdown()
+        if self._unsub_flush:
+            self._unsub_flush()
+            self._unsub_flush = None
+
+    @callback
+    def _async_notify(self, changed: set[str]) -> None:
+        if not changed:
+            return
+        listeners = self._state_listeners
+        callbacks = set(listeners.get(None, ()))
+        for key in changed:
+            callbacks.update(listeners.get(key, ()))
+        self.metrics.entity_updates += len(callbacks)
+        for update_callback in callbacks:
+            update_callback()
+
+
+class AnovaCoordinator(AnovaOvenUpdateListener):
+    """Config entry coordinator, routes updates to per device coordinators.
+
+    The websocket connection may be shared with other entries of the same
+    account, each entry listens to it with its own coordinator.
+    """
+
+    def __init__(
+        self,
+        connection: AnovaConnection,
+        hass: HomeAssistant,
+        entry: ConfigEntry,
+        devices: list[AnovaPrecisionOven],
+        unit_of_temperature: AnovaUnitOfTemperature = AnovaUnitOfTemperature.CELSIUS,
+        update_policies: dict[str, UpdatePolicy] | None = None,
+    ) -> None:
+        """Set up Anova Coordinator."""
+        connection.api.add_listener(self)
+        self.connection = connection
+        self.api: AnovaOvenApi = connection.api
+        self.unit_of_temperature = unit_of_temperature
         self.hass: HomeAssistant = hass
         self.entry: ConfigEntry = entry
         self.devices = {d.cooker_id: d for d in devices}
-        self._task: Task | None = None
+        self.metrics = CoordinatorMetrics()
+        self.update_policies = update_policies or {}
+        self.coordinators: dict[str, AnovaDeviceCoordinator] = {
+            d.cooker_id: self._device_coordinator(d) for d in devices
+        }
+        # cooker_id -> device registry id, filled on first use.
+        self._device_ids: dict[str, str] = {}
+        self._resolved: dict[str, tuple[str, AnovaCoordinator]] = hass.data.setdefault(
+            DATA_DEVICES, {}
+        )
+        self.telemetry: dict[str, OvenTelemetry] = {}
+        self._store: Store[dict] = Store(
+            hass, STORAGE_VERSION, STORAGE_KEY.format(entry.entry_id)
+        )
+        # A delayed save is scheduled once, rescheduling it on every state
+        # would push it back for as long as an oven reports.
+        self._save_scheduled = False
+
+    def _device_coordinator(self, device: AnovaPrecisionOven) -> AnovaDeviceCoordinator:
+        fahrenheit = self.unit_of_temperature == AnovaUnitOfTemperature.FAHRENHEIT
+        return AnovaDeviceCoordinator(
+            self.hass,
+            device,
+            self.metrics,
+            UpdateFilter(self.update_policies, fahrenheit),
+        )
 
     @callback
     async def async_setup(self) -> None:
@@ -50,18 +222,108 @@ class AnovaCoordinator(DataUpdateCoordinator[APOState], AnovaOvenUpdateListener)
         #     model="Precision Oven",
         #     sw_version=firmware_version,
         # )
-        self._task = self.entry.async_create_background_task(
-            hass=self.hass, target=self.api.run(), name="Anova Oven WS Task"
+        await self._async_restore_states()
+        self.entry.async_on_unload(
+            self.connection.async_add_stop_listener(self._async_connection_stopped)
+        )
+        self.connection.async_start()
+        self.entry.async_on_unload(
+            async_track_time_interval(
+                self.hass, self._async_publish_metrics, METRICS_INTERVAL
+            )
         )
-        await sleep(5)
+        self.entry.async_on_unload(
+            self.hass.bus.async_listen(
+                device_registry.EVENT_DEVICE_REGISTRY_UPDATED,
+                self._async_device_registry_updated,
+            )
+        )
+        if not await self.api.wait_ready(READY_TIMEOUT):
+            _LOGGER.info(
+                "No response from Anova cloud yet, ovens stay unavailable until"
+                " their state arrives"
+            )
+
+    async def async_unload(self) -> None:
+        """Write pending state changes and leave the connection."""
+        await self._store.async_save(self._data_to_save())
+        for coordinator in self.coordinators.values():
+            await coordinator.async_shutdown()
+        for device_id in [k for k, v in self._resolved.items() if v[1] is self]:
+            del self._resolved[device_id]
+        self.api.remove_listener(self)
+        await self.connection.async_release(self.entry.entry_id)
+
+    async def _async_restore_states(self) -> None:
+        """Load the energy totals and last known (stale) states of the ovens."""
+        if not (data := await self._store.async_load()):
+            return
+        for cooker_id, total_energy in data.get("energy", {}).items():
+            if coordinator := self.coordinators.get(cooker_id):
+                coordinator.session.total_energy = total_energy
+        for cooker_id, raw_state in data.get("states", {}).items():
+            device = self.devices.get(cooker_id)
+            if device is None or device.state is not None:
+                continue
+            try:
+                state = self.api.restore_state(device, raw_state)
+            except Exception:  # pylint: disable=broad-except
+                _LOGGER.warning("Ignoring invalid stored state of %s", cooker_id)
+                continue
+            self.coordinators[cooker_id].async_set_state(state, stale=True)
+
+    @callback
+    def _data_to_save(self) -> dict:
+        self._save_scheduled = False
+        return {
+            "states": {
+                cooker_id: device.raw_state
+                for cooker_id, device in self.devices.items()
+                if device.raw_state is not None
+            },
+            "energy": {
+                cooker_id: coordinator.session.total_energy
+                for cooker_id, coordinator in self.coordinators.items()
+            },
+        }
+
+    @callback
+    def _async_publish_metrics(self, _now: datetime) -> None:
+        async_dispatcher_send(self.hass, SIGNAL_METRICS.format(self.entry.entry_id))
+
+    @callback
+    def _async_connection_stopped(self, err: Exception) -> None:
+        for coordinator in self.coordinators.values():
+            coordinator.async_set_unavailable()
 
     async def on_state(self, device: AnovaPrecisionOven, state: APOState):
-        self.devices[device.cooker_id] = device
-        self.async_set_updated_data(state)
+        start = time.perf_counter()
+        if (coordinator := self.coordinators.get(device.cooker_id)) is None:
+            coordinator = self._add_device(device)
+        coordinator.async_set_state(state)
+        if not self._save_scheduled:
+            self._save_scheduled = True
+            self._store.async_delay_save(self._data_to_save, SAVE_DELAY)
+        if (telemetry := self.telemetry.get(device.cooker_id)) is None:
+            telemetry = self.telemetry[device.cooker_id] = OvenTelemetry()
+        telemetry.record(time.time(), state)
+        self.metrics.states += 1
+        self.metrics.update.observe(time.perf_counter() - start)
 
     async def on_new_device(self, device: AnovaPrecisionOven):
+        if device.cooker_id not in self.coordinators:
+            self._add_device(device)
+
+    @callback
+    def _add_device(self, device: AnovaPrecisionOven) -> AnovaDeviceCoordinator:
         self.devices[device.cooker_id] = device
-        self.async_set_updated_data(None)
+        coordinator = self.coordinators[device.cooker_id] = self._device_coordinator(
+            device
+        )
+        async_dispatcher_send(
+            self.hass, SIGNAL_NEW_DEVICE.format(self.entry.entry_id), coordinator
+        )
+        return coordinator
 
     async def on_new_token(self, access_token: str, refresh_token: str):
         self.hass.config_entries.async_update_entry(
@@ -72,10 +334,26 @@ class AnovaCoordinator(DataUpdateCoordinator[APOState], AnovaOvenUpdateListener)
         self.entry = self.hass.config_entries.async_get_entry(self.entry.entry_id)
 
     async def on_target_reached(self, device: AnovaPrecisionOven, target: Target):
-        dr = device_registry.async_get(self.hass)
-        d = dr.async_get_device(identifiers={(DOMAIN, device.cooker_id)})
+        if (device_id := self._device_id(device.cooker_id)) is None:
+            _LOGGER.debug("Device %s is not registered", device.cooker_id)
+            return
         event_data = {
-            "device_id": d.id,
+            "device_id": device_id,
             "type": "cook_target_reached",
         }
         self.hass.bus.async_fire(EVENT_COOK_TARGET_REACHED, event_data)
+
+    @callback
+    def _device_id(self, cooker_id: str) -> str | None:
+        if (device_id := self._device_ids.get(cooker_id)) is None:
+            dr = device_registry.async_get(self.hass)
+            if d := dr.async_get_device(identifiers={(DOMAIN, cooker_id)}):
+                device_id = self._device_ids[cooker_id] = d.id
+                self._resolved.setdefault(device_id, (cooker_id, self))
+        return device_id
+
+    @callback
+    def _async_device_registry_updated(self, event: Event) -> None:
+        self._resolved.pop(event.data["device_id"], None)
+        if event.data["action"] == "remove":
+            self._device_ids.clear()
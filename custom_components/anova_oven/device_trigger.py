@@ -14,6 +14,7 @@ from homeassistant.const import (
     CONF_TYPE,
 )
 from homeassistant.core import CALLBACK_TYPE, HomeAssistant
+from homeassistant.helpers import device_registry as dr
 from homeassistant.helpers.trigger import TriggerActionType, TriggerInfo
 from homeassistant.helpers.typing import ConfigType
 
@@ -31,6 +32,10 @@ async def async_get_triggers(
     hass: HomeAssistant, device_id: str
 ) -> list[dict[str, str]]:
     triggers = []
+    # The entry's cloud service device has no cooks.
+    device = dr.async_get(hass).async_get(device_id)
+    if device is None or device.entry_type is dr.DeviceEntryType.SERVICE:
+        return triggers
 
     triggers.append(
         {
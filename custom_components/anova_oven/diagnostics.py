@@ -0,0 +1,40 @@
+"""Diagnostics support for the Anova Precision Oven integration."""
+
+from __future__ import annotations
+
+from typing import Any
+
+from homeassistant.components.diagnostics import async_redact_data
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import CONF_ACCESS_TOKEN
+from homeassistant.core import HomeAssistant
+
+from .const import CONF_APP_KEY, CONF_REFRESH_TOKEN, DOMAIN
+from .coordinator import AnovaCoordinator
+
+TO_REDACT = {CONF_ACCESS_TOKEN, CONF_REFRESH_TOKEN, CONF_APP_KEY}
+
+
+async def async_get_config_entry_diagnostics(
+    hass: HomeAssistant, entry: ConfigEntry
+) -> dict[str, Any]:
+    """Return the metrics and last oven states of a config entry.
+
+    Connection metrics are shared by the entries of the same account.
+    """
+    coordinator: AnovaCoordinator = hass.data[DOMAIN][entry.entry_id]
+    return {
+        "entry": async_redact_data(entry.as_dict(), TO_REDACT),
+        "connection": {
+            "shared_by_entries": len(coordinator.connection.entry_ids),
+            "metrics": coordinator.api.metrics.as_dict(),
+        },
+        "coordinator": coordinator.metrics.as_dict(),
+        "devices": {
+            cooker_id: {
+                "stale": device_coordinator.stale,
+                "state": device_coordinator.device.raw_state,
+            }
+            for cooker_id, device_coordinator in coordinator.coordinators.items()
+        },
+    }
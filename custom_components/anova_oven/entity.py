@@ -7,31 +7,40 @@ from homeassistant.helpers.entity import Entity, EntityDescription
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
 from .const import DOMAIN
-from .coordinator import AnovaCoordinator
+from .coordinator import AnovaDeviceCoordinator
 
 
-class AnovaOvenEntity(CoordinatorEntity[AnovaCoordinator], Entity):
+class AnovaOvenEntity(CoordinatorEntity[AnovaDeviceCoordinator], Entity):
     """Defines an Anova entity."""
 
     _attr_has_entity_name = True
 
-    def __init__(self, cooker_id: str, coordinator: AnovaCoordinator) -> None:
+    def __init__(
+        self,
+        coordinator: AnovaDeviceCoordinator,
+        state_keys: tuple[str, ...] = (),
+    ) -> None:
         """Initialize the Anova entity."""
-        super().__init__(coordinator)
-        self.cooker_id = cooker_id
+        super().__init__(coordinator, context=state_keys)
+        self.cooker_id = coordinator.device.cooker_id
+
+    @property
+    def available(self) -> bool:
+        """Return if the oven has reported its state."""
+        return super().available and self.coordinator.data is not None
 
     @property
     def device_info(self) -> DeviceInfo:
-        if device := self.coordinator.devices.get(self.cooker_id):
-            return DeviceInfo(
-                identifiers={(DOMAIN, self.cooker_id)},
-                name="Anova Precision Oven",
-                manufacturer="Anova",
-                model="Precision Oven",
-                sw_version=device.state.sensor.firmware_version
-                if device.state
-                else "0.0.0",
-            )
+        device = self.coordinator.device
+        return DeviceInfo(
+            identifiers={(DOMAIN, self.cooker_id)},
+            name="Anova Precision Oven",
+            manufacturer="Anova",
+            model="Precision Oven",
+            sw_version=device.state.sensor.firmware_version
+            if device.state
+            else "0.0.0",
+        )
 
 
 class AnovaOvenDescriptionEntity(AnovaOvenEntity):
@@ -39,12 +48,11 @@ class AnovaOvenDescriptionEntity(AnovaOvenEntity):
 
     def __init__(
         self,
-        cooker_id: str,
-        coordinator: AnovaCoordinator,
+        coordinator: AnovaDeviceCoordinator,
         description: EntityDescription,
     ) -> None:
         """Initialize the entity and declare unique id based on description key."""
-        super().__init__(cooker_id, coordinator)
+        super().__init__(coordinator, getattr(description, "state_keys", ()))
         self.entity_description = description
         self._attr_unique_id = f"{self.cooker_id}_{description.key}"
         if hasattr(description, "extra_state_attributes"):
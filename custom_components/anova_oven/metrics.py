@@ -0,0 +1,100 @@
+"""Counters and timing histograms of the websocket and update paths."""
+
+from __future__ import annotations
+
+from bisect import bisect_left
+from dataclasses import dataclass, field, fields
+
+# Upper bounds of the histogram buckets in seconds, 50us doubling up to ~100s.
+BUCKETS = tuple(0.00005 * 2**idx for idx in range(22))
+
+
+class Histogram:
+    """Counts durations in fixed exponential buckets, observing is O(log n)."""
+
+    __slots__ = ("counts", "count", "total", "max")
+
+    def __init__(self) -> None:
+        # The last count is for durations above the last bucket.
+        self.counts = [0] * (len(BUCKETS) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def observe(self, seconds: float) -> None:
+        self.counts[bisect_left(BUCKETS, seconds)] += 1
+        self.count += 1
+        self.total += seconds
+        if seconds > self.max:
+            self.max = seconds
+
+    def percentile(self, pct: float) -> float | None:
+        """Upper bound of the bucket holding the ``pct`` percentile."""
+        if not self.count:
+            return None
+        rank = self.count * pct / 100
+        seen = 0
+        for bound, count in zip(BUCKETS, self.counts):
+            seen += count
+            if seen >= rank and count:
+                return min(bound, self.max)
+        return self.max
+
+    def as_dict(self) -> dict:
+        """Summary in milliseconds."""
+
+        def ms(seconds: float | None) -> float | None:
+            return None if seconds is None else round(seconds * 1000, 3)
+
+        return {
+            "count": self.count,
+            "mean_ms": ms(self.total / self.count if self.count else None),
+            "p50_ms": ms(self.percentile(50)),
+            "p90_ms": ms(self.percentile(90)),
+            "p99_ms": ms(self.percentile(99)),
+            "max_ms": ms(self.max),
+        }
+
+
+def _as_dict(metrics) -> dict:
+    return {
+        f.name: value.as_dict() if isinstance(value, Histogram) else value
+        for f in fields(metrics)
+        if (value := getattr(metrics, f.name)) is not None
+    }
+
+
+@dataclass(slots=True)
+class ApiMetrics:
+    """Metrics of one websocket connection, shared by its config entries."""
+
+    frames_received: int = 0
+    frames_decoded: int = 0
+    frames_failed: int = 0
+    # States replaced by a newer one before a listener got them.
+    states_coalesced: int = 0
+    events_dropped: int = 0
+    commands: int = 0
+    command_errors: int = 0
+    connects: int = 0
+    reconnects: int = 0
+    token_refreshes: int = 0
+    decode: Histogram = field(default_factory=Histogram)
+    dispatch: Histogram = field(default_factory=Histogram)
+    command_round_trip: Histogram = field(default_factory=Histogram)
+
+    def as_dict(self) -> dict:
+        return _as_dict(self)
+
+
+@dataclass(slots=True)
+class CoordinatorMetrics:
+    """Metrics of the state updates of one config entry."""
+
+    states: int = 0
+    # Entity callbacks run for changed state keys.
+    entity_updates: int = 0
+    update: Histogram = field(default_factory=Histogram)
+
+    def as_dict(self) -> dict:
+        return _as_dict(self)
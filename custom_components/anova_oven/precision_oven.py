@@ -1,6 +1,10 @@
 import logging
+from collections.abc import Callable
 from dataclasses import dataclass
-from typing import Generic, Optional, TypeVar
+from operator import attrgetter
+from typing import Any, Generic, Optional, TypeVar
+
+from .codec import dumps
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -17,17 +21,17 @@ STATE_MAP = {
 P = TypeVar("P")
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class Temperature:
     celsius: float
     fahrenheit: float
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class APOSensor:
-    @dataclass
+    @dataclass(frozen=True, slots=True)
     class Nodes:
-        @dataclass
+        @dataclass(frozen=True, slots=True)
         class TemperatureBulbs:
             mode: str
             dosed: bool
@@ -35,27 +39,27 @@ class APOSensor:
             temperature: Temperature
             target_temperature: Temperature
 
-        @dataclass
+        @dataclass(frozen=True, slots=True)
         class TemperatureProbe:
             temperature: Temperature
             target_temperature: Temperature
 
-        @dataclass
+        @dataclass(frozen=True, slots=True)
         class HeatingElement:
             watts: int
             on: bool
 
-        @dataclass
+        @dataclass(frozen=True, slots=True)
         class SteamGenerator:
             mode: str
             relative_humidity: int
             target_humidity: int
 
-        @dataclass
+        @dataclass(frozen=True, slots=True)
         class Cook:
             seconds_elapsed: int
 
-        @dataclass
+        @dataclass(frozen=True, slots=True)
         class Timer:
             mode: str
             initial: int
@@ -80,16 +84,93 @@ class APOSensor:
     nodes: Nodes | None = None
 
 
-@dataclass
+class RawStages:
+    """Stages of the current cook as sent by the oven.
+
+    Stage positions are indexed by id once, the JSON form is only built when
+    it is read.
+    """
+
+    __slots__ = ("cook_id", "stages", "_index", "_json")
+
+    def __init__(self, cook_id: str | None, stages: list[dict] | None) -> None:
+        self.cook_id = cook_id
+        self.stages = stages or []
+        self._index = {
+            stage.get("id"): idx for idx, stage in enumerate(self.stages, start=1)
+        }
+        self._json: str | None = None
+
+    def index(self, stage_id: str | None) -> int | None:
+        """Return the 1 based position of a stage."""
+        return self._index.get(stage_id)
+
+    @property
+    def json(self) -> str:
+        if self._json is None:
+            self._json = dumps(self.stages)
+        return self._json
+
+    def __len__(self) -> int:
+        return len(self.stages)
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, RawStages):
+            return NotImplemented
+        return self.cook_id == other.cook_id and self.stages == other.stages
+
+    def __hash__(self) -> int:
+        return hash((self.cook_id, self.json))
+
+    def __repr__(self) -> str:
+        return f"RawStages(cook_id={self.cook_id!r}, stages={len(self)})"
+
+
+@dataclass(frozen=True, slots=True)
 class APOState:
-    @dataclass
+    @dataclass(frozen=True, slots=True)
     class Stages:
-        active: int
+        active: int | None
         count: int
 
     sensor: APOSensor
     stages: Stages
-    raw_stages: str
+    raw_stages: RawStages
+
+
+# Parts of the state entities can subscribe to. Thanks to the decoder reusing
+# unchanged sub-objects most of them are detected by identity.
+STATE_KEYS: dict[str, Callable[[APOState], Any]] = {
+    "mode": attrgetter("sensor.mode"),
+    "firmware_version": attrgetter("sensor.firmware_version"),
+    "cook": attrgetter("sensor.nodes.cook"),
+    "timer": attrgetter("sensor.nodes.timer"),
+    "temperature_bulbs": attrgetter("sensor.nodes.temperature_bulbs"),
+    "temperature_probe": attrgetter("sensor.nodes.temperature_probe"),
+    "steam_generator": attrgetter("sensor.nodes.steam_generator"),
+    "rear_heating": attrgetter("sensor.nodes.rear_heating"),
+    "bottom_heating": attrgetter("sensor.nodes.bottom_heating"),
+    "top_heating": attrgetter("sensor.nodes.top_heating"),
+    "lamp_on": attrgetter("sensor.nodes.lamp_on"),
+    "door_closed": attrgetter("sensor.nodes.door_closed"),
+    "water_tank_empty": attrgetter("sensor.nodes.water_tank_empty"),
+    "fan_speed": attrgetter("sensor.nodes.fan_speed"),
+    "stages": attrgetter("stages"),
+    "raw_stages": attrgetter("raw_stages"),
+}
+
+
+def changed_state_keys(previous: APOState | None, state: APOState) -> set[str]:
+    """Return the STATE_KEYS whose value differs between two states."""
+    if previous is None:
+        return set(STATE_KEYS)
+    if previous is state:
+        return set()
+    return {
+        key
+        for key, getter in STATE_KEYS.items()
+        if (old := getter(previous)) is not (new := getter(state)) and old != new
+    }
 
 
 class Target:
@@ -97,6 +178,14 @@ class Target:
     def reached(self) -> bool:
         pass
 
+    @property
+    def goal(self) -> Any:
+        """What is aimed at, a new goal is tracked from scratch."""
+
+    def left(self, hysteresis: float) -> bool:
+        """Return if a reached target is not met anymore."""
+        return not self.reached
+
 
 @dataclass
 class ProbeTarget(Target):
@@ -111,6 +200,16 @@ class ProbeTarget(Target):
             and self.temperature.celsius >= self.target_temperature.celsius
         )
 
+    @property
+    def goal(self) -> Any:
+        return ("probe", self.target_temperature.celsius)
+
+    def left(self, hysteresis: float) -> bool:
+        return (
+            self.temperature is not None
+            and self.temperature.celsius < self.target_temperature.celsius - hysteresis
+        )
+
 
 @dataclass
 class TimerTarget(Target):
@@ -121,12 +220,69 @@ class TimerTarget(Target):
     def reached(self) -> bool:
         return self.current and self.initial and self.current >= self.initial
 
+    @property
+    def goal(self) -> Any:
+        return ("timer", self.initial)
+
+
+def cook_target(state: APOState) -> Target | None:
+    """Return the probe or timer target of the running cook."""
+    nodes = state.sensor.nodes
+    if nodes.temperature_probe and nodes.temperature_probe.target_temperature:
+        return ProbeTarget(
+            temperature=nodes.temperature_probe.temperature,
+            target_temperature=nodes.temperature_probe.target_temperature,
+        )
+    if nodes.timer and nodes.timer.initial:
+        return TimerTarget(current=nodes.timer.current, initial=nodes.timer.initial)
+    return None
+
+
+class TargetTracker:
+    """Reports once when the cook target of one oven is reached.
+
+    A target counts as reached after it was met on ``confirm`` frames in a row.
+    Once reached it only fires again for a new goal, or after the probe fell
+    ``hysteresis`` degrees (celsius) below the target or the timer restarted.
+    """
+
+    __slots__ = ("confirm", "hysteresis", "_goal", "_hits", "_reached")
+
+    def __init__(self, confirm: int = 2, hysteresis: float = 1.0) -> None:
+        self.confirm = confirm
+        self.hysteresis = hysteresis
+        self._goal: Any = None
+        self._hits = 0
+        self._reached = False
+
+    def update(self, target: Target | None) -> bool:
+        """Feed the target of a frame, return True when it was just reached."""
+        goal = target.goal if target is not None else None
+        if goal != self._goal:
+            self._goal = goal
+            self._hits = 0
+            self._reached = False
+        if target is None:
+            return False
+        if self._reached:
+            if target.left(self.hysteresis):
+                self._reached = False
+                self._hits = 0
+            return False
+        self._hits = self._hits + 1 if target.reached else 0
+        if self._hits >= self.confirm:
+            self._reached = True
+            return True
+        return False
+
 
 class AnovaPrecisionOven:
     def __init__(self, cooker_id: str, type: str) -> None:
         self.cooker_id = cooker_id
         self.type = type
         self.state: APOState | None = None
+        # The state payload ``state`` was decoded from.
+        self.raw_state: dict | None = None
         self.temperature_unit: str = "C"
 
 
@@ -0,0 +1,211 @@
+"""Cook stages compiled once into wire-ready templates, and saved recipes."""
+
+from __future__ import annotations
+
+import dataclasses
+import logging
+import uuid
+from functools import lru_cache
+
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.storage import Store
+
+from .const import DOMAIN, PLATFORM
+from .precision_oven import APOStage
+from .util import dict_keys_to_snake_case, to_camel_case_dict
+
+_LOGGER = logging.getLogger(__name__)
+
+RECIPES_STORAGE_KEY = f"{DOMAIN}.recipes"
+RECIPES_STORAGE_VERSION = 1
+
+_HUMIDITY_SETPOINTS = ("relativeHumidity", "steamPercentage")
+
+
+def _patch_points(stage: dict) -> tuple[tuple[str, tuple[str, ...]], ...]:
+    """Return the values a serialized stage takes and the path to each."""
+    points = []
+    bulbs = stage.get("temperatureBulbs") or {}
+    if (mode := bulbs.get("mode")) and (bulbs.get(mode) or {}).get("setpoint"):
+        points.append(("temperature", ("temperatureBulbs", mode, "setpoint")))
+    if (stage.get("temperatureProbe") or {}).get("setpoint"):
+        points.append(("probe", ("temperatureProbe", "setpoint")))
+    steam = stage.get("steamGenerators") or {}
+    for key in _HUMIDITY_SETPOINTS:
+        if key in steam:
+            points.append(("humidity", ("steamGenerators", key, "setpoint")))
+    if "timer" in stage:
+        points.append(("timer", ("timer", "initial")))
+    return tuple(points)
+
+
+def _set(stage: dict, path: tuple[str, ...], value) -> None:
+    """Set a nested value, copying the dicts on the way to keep the template."""
+    node = stage
+    for key in path[:-1]:
+        child = dict(node[key])
+        node[key] = child
+        node = child
+    node[path[-1]] = value
+
+
+def new_id() -> str:
+    return f"{PLATFORM}-{uuid.uuid4()}"
+
+
+def start_message(cooker_id: str, stages: list[dict]) -> dict:
+    """Return the wire CMD_APO_START command of rendered stages."""
+    return {
+        "command": "CMD_APO_START",
+        "requestId": str(uuid.uuid4()),
+        "payload": {
+            "payload": {"cookId": new_id(), "stages": stages},
+            "type": "CMD_APO_START",
+            "id": cooker_id,
+        },
+    }
+
+
+class StageTemplate:
+    """Stages validated and serialized once, rendered for each cook.
+
+    Rendering copies the serialized stages, gives them new ids and patches
+    the temperature, probe, humidity and timer setpoints given.
+    """
+
+    def __init__(self, stages: list[APOStage]) -> None:
+        self.stages = tuple(to_camel_case_dict(stage) for stage in stages)
+        self._points = tuple(_patch_points(stage) for stage in self.stages)
+
+    @classmethod
+    def from_config(cls, config: list[dict]) -> StageTemplate:
+        """Compile stages in the format of the raw_stages attribute.
+
+        Stage ids and titles are optional, new ids are made for each cook.
+        """
+        try:
+            return cls(
+                [
+                    APOStage(**({"id": "", "title": ""} | dict_keys_to_snake_case(d)))
+                    for d in config
+                ]
+            )
+        except (TypeError, AttributeError) as err:
+            raise ValueError(f"Invalid cook stages: {err}") from err
+
+    def render(
+        self,
+        temperature: dict | None = None,
+        probe: dict | None = None,
+        humidity: int | None = None,
+        timer: int | None = None,
+    ) -> list[dict]:
+        """Return the wire stages of a new cook.
+
+        Temperatures are setpoints with celsius and fahrenheit, the timer is
+        in seconds. Values not given keep the ones of the template.
+        """
+        values = {
+            "temperature": temperature,
+            "probe": probe,
+            "humidity": humidity,
+            "timer": timer,
+        }
+        stages = []
+        for template, points in zip(self.stages, self._points):
+            stage = dict(template)
+            stage["id"] = new_id()
+            for name, path in points:
+                if (value := values[name]) is not None:
+                    _set(stage, path, value)
+            stages.append(stage)
+        return stages
+
+
+@lru_cache(maxsize=64)
+def start_cook_template(
+    sous_vide: bool,
+    preheat_required: bool,
+    user_action_required: bool,
+    heating_bottom: bool,
+    heating_top: bool,
+    heating_rear: bool,
+    steam: bool,
+    probe_added: bool,
+    timer_added: bool,
+) -> StageTemplate:
+    """Stages of the start_cook service, setpoints are patched on render."""
+    setpoint = APOStage.TemperatureSetpoint(celsius=0, fahrenheit=0)
+    preheat_stage = APOStage(
+        step_type="stage",
+        id="",
+        title="",
+        description="",
+        type="preheat",
+        user_action_required=user_action_required,
+        temperature_bulbs=APOStage.TemperatureBulbs(
+            dry=APOStage.TemperatureBulb(setpoint=setpoint) if not sous_vide else None,
+            wet=APOStage.TemperatureBulb(setpoint=setpoint) if sous_vide else None,
+            mode="wet" if sous_vide else "dry",
+        ),
+        heating_elements=APOStage.HeatingElements(
+            bottom=APOStage.On(on=heating_bottom),
+            top=APOStage.On(on=heating_top),
+            rear=APOStage.On(on=heating_rear),
+        ),
+        fan=APOStage.Fan(speed=100),
+        vent=APOStage.Vent(open=False),
+        rack_position=3,
+        steam_generators=APOStage.SteamGenerators(
+            mode="relative-humidity" if sous_vide else "steam-percentage",
+            relative_humidity=APOStage.SteamGenerators.Setpoint(setpoint=0)
+            if sous_vide
+            else None,
+            steam_percentage=APOStage.SteamGenerators.Setpoint(setpoint=0)
+            if not sous_vide
+            else None,
+        )
+        if steam
+        else None,
+        probe_added=probe_added,
+        temperature_probe=APOStage.Probe(setpoint=setpoint) if probe_added else None,
+    )
+    cook_stage = dataclasses.replace(
+        preheat_stage,
+        type="cook",
+        timer_added=timer_added,
+        timer=APOStage.Timer(initial=0) if timer_added else None,
+    )
+    if preheat_required:
+        return StageTemplate([preheat_stage, cook_stage])
+    return StageTemplate([cook_stage])
+
+
+class RecipeBook:
+    """Named stage templates registered by the user, kept across restarts."""
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        self._store: Store[dict] = Store(
+            hass, RECIPES_STORAGE_VERSION, RECIPES_STORAGE_KEY
+        )
+        self._configs: dict[str, list[dict]] = {}
+        self._templates: dict[str, StageTemplate] = {}
+
+    async def async_load(self) -> None:
+        self._configs = (await self._store.async_load()) or {}
+        for name, config in self._configs.items():
+            try:
+                self._templates[name] = StageTemplate.from_config(config)
+            except ValueError as err:
+                _LOGGER.warning("Ignoring recipe %s: %s", name, err)
+
+    def register(self, name: str, config: list[dict]) -> None:
+        """Compile and save a recipe, replacing one with the same name."""
+        self._templates[name] = StageTemplate.from_config(config)
+        self._configs[name] = config
+        self._store.async_delay_save(lambda: self._configs, 1)
+
+    def get(self, name: str) -> StageTemplate:
+        if (template := self._templates.get(name)) is None:
+            raise ValueError(f"Unknown recipe {name}.")
+        return template
@@ -4,6 +4,9 @@ from __future__ import annotations
 
 from collections.abc import Callable
 from dataclasses import dataclass, field
+from functools import cache
+
+import voluptuous as vol
 
 from homeassistant import config_entries
 from homeassistant.components.climate.const import ClimateEntityFeature
@@ -16,17 +19,72 @@ from homeassistant.components.sensor import (
 from homeassistant.const import (
     CONF_TEMPERATURE_UNIT,
     PERCENTAGE,
+    EntityCategory,
+    UnitOfEnergy,
     UnitOfPower,
     UnitOfTime,
 )
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, ServiceCall, callback
+from homeassistant.helpers import entity_platform, entity_registry
+from homeassistant.helpers.device_registry import DeviceEntryType, DeviceInfo
+from homeassistant.helpers.dispatcher import async_dispatcher_connect
+from homeassistant.helpers.entity import Entity
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.helpers.typing import StateType
 
-from .const import DOMAIN, AnovaUnitOfTemperature
-from .coordinator import AnovaCoordinator
+from .const import (
+    ATTR_STALE,
+    CLOUD_MODEL,
+    DOMAIN,
+    SIGNAL_METRICS,
+    SIGNAL_NEW_DEVICE,
+    AnovaUnitOfTemperature,
+)
+from .coordinator import AnovaCoordinator, AnovaDeviceCoordinator
 from .entity import AnovaOvenDescriptionEntity
+from .metrics import Histogram
 from .precision_oven import APOSensor
+from .session import SessionTracker
+
+SERVICE_SET_SIGNIFICANT_CHANGE = "set_significant_change"
+ATTR_DEADBAND = "deadband"
+ATTR_PRECISION = "precision"
+
+SET_SIGNIFICANT_CHANGE_SCHEMA = {
+    vol.Optional(ATTR_DEADBAND): vol.All(vol.Coerce(float), vol.Range(min=0)),
+    vol.Optional(ATTR_PRECISION): vol.All(vol.Coerce(int), vol.Range(min=0, max=3)),
+}
+
+
+@dataclass(frozen=True, slots=True)
+class SignificantChange:
+    """Rounding and deadband of a sensor's published value."""
+
+    deadband: float = 0
+    # Decimals to round to, None keeps the value as received.
+    precision: int | None = None
+
+    def apply(self, published: StateType, value: StateType) -> StateType:
+        """Return the value to publish, ``published`` for too small a change."""
+        if value is None:
+            return None
+        if self.precision is not None:
+            value = round(value, self.precision) if self.precision else round(value)
+        if published is not None and abs(value - published) < self.deadband:
+            return published
+        return value
+
+
+# Defaults of the noisy measurements, per description key. Entities override
+# them with the set_significant_change service.
+SIGNIFICANT_CHANGE_DEFAULTS: dict[str, SignificantChange] = {
+    "temperature": SignificantChange(0.2, 1),
+    "temperature_probe": SignificantChange(0.2, 1),
+    "relative_humidity": SignificantChange(1, 0),
+    "rear_watts": SignificantChange(10, 0),
+    "bottom_watts": SignificantChange(10, 0),
+    "top_watts": SignificantChange(10, 0),
+}
 
 
 @dataclass(frozen=True)
@@ -37,6 +95,8 @@ class AnovaOvenSensorEntityDescriptionMixin:
     extra_state_attributes: dict[str, Callable[[APOSensor], float | int | str]] = field(
         default_factory=dict
     )
+    # STATE_KEYS the value and attributes depend on, empty means any change.
+    state_keys: tuple[str, ...] = field(default_factory=tuple)
 
 
 @dataclass(frozen=True)
@@ -46,9 +106,154 @@ class AnovaOvenSensorEntityDescription(
     """Describes a Anova sensor."""
 
 
+@dataclass(frozen=True)
+class AnovaOvenSessionSensorEntityDescriptionMixin:
+    """Describes the mixin variables for anova energy and cook session sensors."""
+
+    value_fn: Callable[[SessionTracker], float | None]
+    state_keys: tuple[str, ...] = field(default_factory=tuple)
+
+
+@dataclass(frozen=True)
+class AnovaOvenSessionSensorEntityDescription(
+    SensorEntityDescription, AnovaOvenSessionSensorEntityDescriptionMixin
+):
+    """Describes a Anova energy or cook session sensor."""
+
+
+SESSION_SENSOR_DESCRIPTIONS = [
+    AnovaOvenSessionSensorEntityDescription(
+        key="energy",
+        state_keys=("session",),
+        translation_key="energy",
+        icon="mdi:lightning-bolt",
+        device_class=SensorDeviceClass.ENERGY,
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        native_unit_of_measurement=UnitOfEnergy.KILO_WATT_HOUR,
+        value_fn=lambda tracker: round(tracker.total_energy, 3),
+    ),
+    AnovaOvenSessionSensorEntityDescription(
+        key="cook_energy",
+        state_keys=("session",),
+        translation_key="cook_energy",
+        icon="mdi:lightning-bolt",
+        device_class=SensorDeviceClass.ENERGY,
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        native_unit_of_measurement=UnitOfEnergy.KILO_WATT_HOUR,
+        value_fn=lambda tracker: tracker.session and round(tracker.session.energy, 3),
+    ),
+    AnovaOvenSessionSensorEntityDescription(
+        key="preheat_duration",
+        state_keys=("session",),
+        translation_key="preheat_duration",
+        icon="mdi:timer-outline",
+        device_class=SensorDeviceClass.DURATION,
+        native_unit_of_measurement=UnitOfTime.SECONDS,
+        value_fn=lambda tracker: tracker.session and tracker.session.preheat_duration,
+    ),
+    AnovaOvenSessionSensorEntityDescription(
+        key="probe_target_duration",
+        state_keys=("session",),
+        translation_key="probe_target_duration",
+        icon="mdi:timer-outline",
+        device_class=SensorDeviceClass.DURATION,
+        native_unit_of_measurement=UnitOfTime.SECONDS,
+        value_fn=lambda tracker: tracker.session
+        and tracker.session.probe_target_duration,
+    ),
+    AnovaOvenSessionSensorEntityDescription(
+        key="steam_duration",
+        state_keys=("session",),
+        translation_key="steam_duration",
+        icon="mdi:pot-steam-outline",
+        device_class=SensorDeviceClass.DURATION,
+        native_unit_of_measurement=UnitOfTime.SECONDS,
+        value_fn=lambda tracker: tracker.session
+        and round(tracker.session.steam_duration),
+    ),
+]
+
+
+@dataclass(frozen=True)
+class AnovaOvenMetricSensorEntityDescriptionMixin:
+    """Describes the mixin variables for anova diagnostic metric sensors."""
+
+    value_fn: Callable[[AnovaCoordinator], StateType]
+
+
+@dataclass(frozen=True)
+class AnovaOvenMetricSensorEntityDescription(
+    SensorEntityDescription, AnovaOvenMetricSensorEntityDescriptionMixin
+):
+    """Describes a Anova diagnostic metric sensor."""
+
+
+def _p90_ms(histogram: Histogram) -> float | None:
+    value = histogram.percentile(90)
+    return None if value is None else round(value * 1000, 3)
+
+
+# Metrics of the entry's connection and updates, on the entry's service device.
+METRIC_SENSOR_DESCRIPTIONS = [
+    AnovaOvenMetricSensorEntityDescription(
+        key="frames_received",
+        translation_key="frames_received",
+        icon="mdi:counter",
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        entity_category=EntityCategory.DIAGNOSTIC,
+        entity_registry_enabled_default=False,
+        value_fn=lambda c: c.api.metrics.frames_received,
+    ),
+    AnovaOvenMetricSensorEntityDescription(
+        key="reconnects",
+        translation_key="reconnects",
+        icon="mdi:connection",
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        entity_category=EntityCategory.DIAGNOSTIC,
+        entity_registry_enabled_default=False,
+        value_fn=lambda c: c.api.metrics.reconnects,
+    ),
+    AnovaOvenMetricSensorEntityDescription(
+        key="decode_time",
+        translation_key="decode_time",
+        icon="mdi:timer-outline",
+        device_class=SensorDeviceClass.DURATION,
+        native_unit_of_measurement=UnitOfTime.MILLISECONDS,
+        state_class=SensorStateClass.MEASUREMENT,
+        entity_category=EntityCategory.DIAGNOSTIC,
+        entity_registry_enabled_default=False,
+        value_fn=lambda c: _p90_ms(c.api.metrics.decode),
+    ),
+    AnovaOvenMetricSensorEntityDescription(
+        key="update_time",
+        translation_key="update_time",
+        icon="mdi:timer-outline",
+        device_class=SensorDeviceClass.DURATION,
+        native_unit_of_measurement=UnitOfTime.MILLISECONDS,
+        state_class=SensorStateClass.MEASUREMENT,
+        entity_category=EntityCategory.DIAGNOSTIC,
+        entity_registry_enabled_default=False,
+        value_fn=lambda c: _p90_ms(c.metrics.update),
+    ),
+    AnovaOvenMetricSensorEntityDescription(
+        key="command_round_trip",
+        translation_key="command_round_trip",
+        icon="mdi:timer-outline",
+        device_class=SensorDeviceClass.DURATION,
+        native_unit_of_measurement=UnitOfTime.MILLISECONDS,
+        state_class=SensorStateClass.MEASUREMENT,
+        entity_category=EntityCategory.DIAGNOSTIC,
+        entity_registry_enabled_default=False,
+        value_fn=lambda c: _p90_ms(c.api.metrics.command_round_trip),
+    ),
+]
+
+
+# Descriptions only depend on the unit, every oven of that unit shares them.
+@cache
 def sensor_descriptions(
     unit_of_temperature: AnovaUnitOfTemperature,
-) -> list[SensorEntityDescription]:  # noqa: D103
+) -> tuple[AnovaOvenSensorEntityDescription, ...]:  # noqa: D103
     def temp_getter(x):
         return x.celsius
 
@@ -58,12 +263,13 @@ def sensor_descriptions(
             def temp_getter(x):
                 return x.fahrenheit
 
-    return [
+    return (
         AnovaOvenSensorEntityDescription(
             key="mode",
+            state_keys=("mode", "raw_stages"),
             translation_key="mode",
             value_fn=lambda data: data.sensor.mode,
-            extra_state_attributes={"raw_stages": lambda s: s.raw_stages},
+            extra_state_attributes={"raw_stages": lambda s: s.raw_stages.json},
         ),
         # AnovaOvenSensorEntityDescription(
         #     key="bulb_mode",
@@ -72,6 +278,7 @@ def sensor_descriptions(
         # ),
         AnovaOvenSensorEntityDescription(
             key="temperature",
+            state_keys=("temperature_bulbs",),
             translation_key="temperature",
             native_unit_of_measurement=unit_of_temperature,
             device_class=SensorDeviceClass.TEMPERATURE,
@@ -83,6 +290,7 @@ def sensor_descriptions(
         ),
         AnovaOvenSensorEntityDescription(
             key="target_temperature",
+            state_keys=("temperature_bulbs",),
             translation_key="target_temperature",
             native_unit_of_measurement=unit_of_temperature,
             device_class=SensorDeviceClass.TEMPERATURE,
@@ -94,6 +302,7 @@ def sensor_descriptions(
         ),
         AnovaOvenSensorEntityDescription(
             key="temperature_probe",
+            state_keys=("temperature_probe",),
             translation_key="temperature_probe",
             native_unit_of_measurement=unit_of_temperature,
             device_class=SensorDeviceClass.TEMPERATURE,
@@ -108,6 +317,7 @@ def sensor_descriptions(
         ),
         AnovaOvenSensorEntityDescription(
             key="target_temperature_probe",
+            state_keys=("temperature_probe",),
             translation_key="target_temperature_probe",
             native_unit_of_measurement=unit_of_temperature,
             device_class=SensorDeviceClass.TEMPERATURE,
@@ -122,6 +332,7 @@ def sensor_descriptions(
         ),
         AnovaOvenSensorEntityDescription(
             key="rear_watts",
+            state_keys=("rear_heating",),
             device_class=SensorDeviceClass.POWER,
             native_unit_of_measurement=UnitOfPower.WATT,
             state_class=SensorStateClass.MEASUREMENT,
@@ -131,6 +342,7 @@ def sensor_descriptions(
         ),
         AnovaOvenSensorEntityDescription(
             key="bottom_watts",
+            state_keys=("bottom_heating",),
             device_class=SensorDeviceClass.POWER,
             native_unit_of_measurement=UnitOfPower.WATT,
             state_class=SensorStateClass.MEASUREMENT,
@@ -140,6 +352,7 @@ def sensor_descriptions(
         ),
         AnovaOvenSensorEntityDescription(
             key="top_watts",
+            state_keys=("top_heating",),
             device_class=SensorDeviceClass.POWER,
             native_unit_of_measurement=UnitOfPower.WATT,
             state_class=SensorStateClass.MEASUREMENT,
@@ -149,6 +362,7 @@ def sensor_descriptions(
         ),
         AnovaOvenSensorEntityDescription(
             key="fan_speed",
+            state_keys=("fan_speed",),
             device_class=SensorDeviceClass.POWER_FACTOR,
             native_unit_of_measurement=PERCENTAGE,
             state_class=SensorStateClass.MEASUREMENT,
@@ -158,12 +372,14 @@ def sensor_descriptions(
         ),
         AnovaOvenSensorEntityDescription(
             key="steam_generator_mode",
+            state_keys=("steam_generator",),
             translation_key="steam_generator_mode",
             value_fn=lambda data: data.sensor.nodes.steam_generator.mode,
             extra_state_attributes={},
         ),
         AnovaOvenSensorEntityDescription(
             key="relative_humidity",
+            state_keys=("steam_generator",),
             device_class=SensorDeviceClass.HUMIDITY,
             native_unit_of_measurement=PERCENTAGE,
             state_class=SensorStateClass.MEASUREMENT,
@@ -173,6 +389,7 @@ def sensor_descriptions(
         ),
         AnovaOvenSensorEntityDescription(
             key="target_humidity",
+            state_keys=("steam_generator",),
             device_class=SensorDeviceClass.HUMIDITY,
             native_unit_of_measurement=PERCENTAGE,
             state_class=SensorStateClass.MEASUREMENT,
@@ -182,6 +399,7 @@ def sensor_descriptions(
         ),
         AnovaOvenSensorEntityDescription(
             key="cook_time",
+            state_keys=("cook",),
             state_class=SensorStateClass.TOTAL_INCREASING,
             native_unit_of_measurement=UnitOfTime.SECONDS,
             icon="mdi:clock-outline",
@@ -192,6 +410,7 @@ def sensor_descriptions(
         ),
         AnovaOvenSensorEntityDescription(
             key="timer",
+            state_keys=("timer",),
             state_class=SensorStateClass.TOTAL_INCREASING,
             native_unit_of_measurement=UnitOfTime.SECONDS,
             icon="mdi:clock-outline",
@@ -202,6 +421,7 @@ def sensor_descriptions(
         ),
         AnovaOvenSensorEntityDescription(
             key="timer_initial",
+            state_keys=("timer",),
             state_class=SensorStateClass.TOTAL,
             native_unit_of_measurement=UnitOfTime.SECONDS,
             icon="mdi:clock-outline",
@@ -212,12 +432,14 @@ def sensor_descriptions(
         ),
         AnovaOvenSensorEntityDescription(
             key="timer_mode",
+            state_keys=("timer",),
             translation_key="timer_mode",
             value_fn=lambda data: data.sensor.nodes.timer.mode,
             extra_state_attributes={},
         ),
         AnovaOvenSensorEntityDescription(
             key="active_stage",
+            state_keys=("stages",),
             state_class=SensorStateClass.MEASUREMENT,
             translation_key="active_stage",
             value_fn=lambda data: data.stages.active,
@@ -225,12 +447,13 @@ def sensor_descriptions(
         ),
         AnovaOvenSensorEntityDescription(
             key="stages_count",
+            state_keys=("stages",),
             state_class=SensorStateClass.MEASUREMENT,
             translation_key="stages_count",
             value_fn=lambda data: data.stages.count,
             extra_state_attributes={},
         ),
-    ]
+    )
 
 
 async def async_setup_entry(
@@ -240,21 +463,142 @@ async def async_setup_entry(
 ) -> None:
     """Set up Anova device."""
     coordinator: AnovaCoordinator = hass.data[DOMAIN][entry.entry_id]
-    unit_of_temperature = AnovaUnitOfTemperature(
-        entry.options.get(CONF_TEMPERATURE_UNIT, AnovaUnitOfTemperature.CELSIUS)
+    descriptions = sensor_descriptions(
+        AnovaUnitOfTemperature(
+            entry.options.get(CONF_TEMPERATURE_UNIT, AnovaUnitOfTemperature.CELSIUS)
+        )
     )
+
+    @callback
+    def async_add_device(device_coordinator: AnovaDeviceCoordinator) -> None:
+        async_add_entities(
+            AnovaOvenSensor(device_coordinator, description)
+            for description in descriptions
+        )
+        async_add_entities(
+            AnovaOvenSessionSensor(device_coordinator, description)
+            for description in SESSION_SENSOR_DESCRIPTIONS
+        )
+
     async_add_entities(
-        AnovaOvenSensor(device[0], coordinator, description)
-        for device in coordinator.devices.items()
-        for description in sensor_descriptions(unit_of_temperature)
+        AnovaOvenMetricSensor(coordinator, description)
+        for description in METRIC_SENSOR_DESCRIPTIONS
+    )
+    for device_coordinator in coordinator.coordinators.values():
+        async_add_device(device_coordinator)
+    entry.async_on_unload(
+        async_dispatcher_connect(
+            hass, SIGNAL_NEW_DEVICE.format(entry.entry_id), async_add_device
+        )
+    )
+
+    platform = entity_platform.async_get_current_platform()
+    platform.async_register_entity_service(
+        SERVICE_SET_SIGNIFICANT_CHANGE,
+        SET_SIGNIFICANT_CHANGE_SCHEMA,
+        _async_set_significant_change,
+    )
+
+
+async def _async_set_significant_change(entity: Entity, call: ServiceCall) -> None:
+    if (
+        not isinstance(entity, AnovaOvenSensor)
+        or entity.entity_description.key not in SIGNIFICANT_CHANGE_DEFAULTS
+    ):
+        raise ValueError(
+            f"{entity.entity_id} does not support significant change filtering."
+        )
+    # Stored in the entity registry options, async_registry_entry_updated
+    # applies them. Fields left out return to the defaults.
+    entity_registry.async_get(entity.hass).async_update_entity_options(
+        entity.entity_id,
+        DOMAIN,
+        {
+            key: call.data[key]
+            for key in (ATTR_DEADBAND, ATTR_PRECISION)
+            if key in call.data
+        },
     )
 
 
 class AnovaOvenSensor(AnovaOvenDescriptionEntity, SensorEntity):
-    """A sensor using Anova coordinator."""
+    """A sensor using Anova coordinator.
+
+    The value and attributes are computed once per state update, not on each
+    read of the properties. Sensors with a significant change filter publish
+    the value rounded, and only when it moved by the deadband from the last
+    published value.
+    """
 
     entity_description: AnovaOvenSensorEntityDescription
 
+    def __init__(
+        self,
+        coordinator: AnovaDeviceCoordinator,
+        description: AnovaOvenSensorEntityDescription,
+    ) -> None:
+        super().__init__(coordinator, description)
+        self._significant_change = SIGNIFICANT_CHANGE_DEFAULTS.get(description.key)
+        self._published_available = False
+        self._published_stale = False
+
+    def _read_significant_change(self) -> None:
+        default = SIGNIFICANT_CHANGE_DEFAULTS.get(self.entity_description.key)
+        if default is None:
+            return
+        options = self.registry_entry.options.get(DOMAIN, {})
+        self._significant_change = SignificantChange(
+            options.get(ATTR_DEADBAND, default.deadband),
+            options.get(ATTR_PRECISION, default.precision),
+        )
+
+    def _update_from_state(self) -> bool:
+        """Compute the value and attributes, True if the state should be written."""
+        description = self.entity_description
+        value = None
+        stale = self.coordinator.stale
+        if state := self.coordinator.device.state:
+            value = description.value_fn(state)
+            self._attr_extra_state_attributes = {
+                key: getter(state)
+                for key, getter in description.extra_state_attributes.items()
+            }
+        self._attr_extra_state_attributes[ATTR_STALE] = stale
+        if self._significant_change is None:
+            self._attr_native_value = value
+            return True
+        published = self._attr_native_value
+        self._attr_native_value = self._significant_change.apply(published, value)
+        available = self.available
+        changed = (
+            self._attr_native_value != published
+            or available != self._published_available
+            or stale != self._published_stale
+        )
+        self._published_available = available
+        self._published_stale = stale
+        return changed
+
+    async def async_added_to_hass(self) -> None:
+        await super().async_added_to_hass()
+        if self._significant_change is not None and self.registry_entry:
+            self._read_significant_change()
+        self._update_from_state()
+
+    @callback
+    def async_registry_entry_updated(self) -> None:
+        super().async_registry_entry_updated()
+        if self._significant_change is not None:
+            self._read_significant_change()
+            # The new rounding and deadband apply from the received value on.
+            self._attr_native_value = None
+            self._update_from_state()
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        if self._update_from_state():
+            self.async_write_ha_state()
+
     @property
     def supported_features(self):
         match self.native_unit_of_measurement:
@@ -263,12 +607,57 @@ class AnovaOvenSensor(AnovaOvenDescriptionEntity, SensorEntity):
             case AnovaUnitOfTemperature.FAHRENHEIT:
                 return ClimateEntityFeature.TARGET_HUMIDITY
 
+
+class AnovaOvenSessionSensor(AnovaOvenDescriptionEntity, SensorEntity):
+    """An energy or cook session sensor of an Anova oven."""
+
+    entity_description: AnovaOvenSessionSensorEntityDescription
+
+    @property
+    def native_value(self) -> StateType:
+        """Return the state."""
+        return self.entity_description.value_fn(self.coordinator.session)
+
+
+class AnovaOvenMetricSensor(SensorEntity):
+    """A diagnostic sensor of the entry's connection and update metrics.
+
+    Refreshed on the entry coordinator's metrics interval, so it keeps
+    updating while no oven reports.
+    """
+
+    _attr_has_entity_name = True
+    _attr_should_poll = False
+    entity_description: AnovaOvenMetricSensorEntityDescription
+
+    def __init__(
+        self,
+        coordinator: AnovaCoordinator,
+        description: AnovaOvenMetricSensorEntityDescription,
+    ) -> None:
+        self.coordinator = coordinator
+        self.entity_description = description
+        entry_id = coordinator.entry.entry_id
+        self._attr_unique_id = f"{entry_id}_{description.key}"
+        self._attr_device_info = DeviceInfo(
+            identifiers={(DOMAIN, entry_id)},
+            name="Anova Cloud",
+            manufacturer="Anova",
+            model=CLOUD_MODEL,
+            entry_type=DeviceEntryType.SERVICE,
+        )
+
+    async def async_added_to_hass(self) -> None:
+        await super().async_added_to_hass()
+        self.async_on_remove(
+            async_dispatcher_connect(
+                self.hass,
+                SIGNAL_METRICS.format(self.coordinator.entry.entry_id),
+                self.async_write_ha_state,
+            )
+        )
+
     @property
     def native_value(self) -> StateType:
         """Return the state."""
-        if state := self.coordinator.devices[self.cooker_id].state:
-            if hasattr(self.entity_description, "extra_state_attributes"):
-                for k, getter in self.entity_description.extra_state_attributes.items():
-                    self._attr_extra_state_attributes[k] = getter(state)
-            return self.entity_description.value_fn(state)
-        return None
+        return self.entity_description.value_fn(self.coordinator)
@@ -0,0 +1,139 @@
+"""Cook session metrics aggregated from the state frames of an oven."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+
+from .precision_oven import APOState
+
+# Longest time a frame's power is assumed to last, bridges reconnects.
+MAX_GAP = 30
+# Degrees (celsius) below the setpoint the cavity counts as preheated.
+PREHEAT_TOLERANCE = 1.0
+JOULES_PER_KWH = 3_600_000
+
+
+@dataclass(slots=True)
+class CookSession:
+    """Metrics of one cook, durations are seconds since the cook started.
+
+    ``started`` is the monotonic time of the first frame of the cook seen.
+    """
+
+    cook_id: str
+    started: float
+    energy: float = 0.0
+    preheat_duration: float | None = None
+    probe_target_duration: float | None = None
+    steam_duration: float = 0.0
+
+
+def _watts(state: APOState) -> int:
+    nodes = state.sensor.nodes
+    return (
+        (nodes.rear_heating.watts or 0)
+        + (nodes.bottom_heating.watts or 0)
+        + (nodes.top_heating.watts or 0)
+    )
+
+
+def _steam_on(state: APOState) -> bool:
+    steam = state.sensor.nodes.steam_generator
+    return steam.mode not in (None, "idle") and bool(steam.target_humidity)
+
+
+def _preheated(state: APOState) -> bool:
+    bulbs = state.sensor.nodes.temperature_bulbs
+    return (
+        bulbs.temperature.celsius is not None
+        and bulbs.target_temperature.celsius is not None
+        and bulbs.temperature.celsius
+        >= bulbs.target_temperature.celsius - PREHEAT_TOLERANCE
+    )
+
+
+def _seconds_elapsed(state: APOState) -> int | None:
+    cook = state.sensor.nodes.cook
+    return cook and cook.seconds_elapsed
+
+
+def _probe_reached(state: APOState) -> bool:
+    probe = state.sensor.nodes.temperature_probe
+    return (
+        probe is not None
+        and probe.temperature is not None
+        and probe.target_temperature is not None
+        and probe.temperature.celsius >= probe.target_temperature.celsius
+    )
+
+
+class SessionTracker:
+    """Integrates the frames of one oven into energy and cook session metrics.
+
+    Each frame's power and steam state are assumed to last until the next
+    frame, so every update is O(1). The last session is kept after its cook
+    ended until a new cook starts.
+    """
+
+    def __init__(self, total_energy: float = 0.0) -> None:
+        self.total_energy = total_energy
+        self.session: CookSession | None = None
+        self._time: float | None = None
+        self._watts = 0
+        self._steam = False
+        # Milestones a cook joined while running had already passed, when is
+        # unknown so they are not reported.
+        self._passed: tuple[bool, bool] = (False, False)
+
+    def published(self) -> tuple:
+        """Values shown by sensors, rounded to what they display."""
+        session = self.session
+        return (
+            round(self.total_energy, 3),
+            session and round(session.energy, 3),
+            session and session.preheat_duration,
+            session and session.probe_target_duration,
+            session and round(session.steam_duration),
+        )
+
+    def update(self, now: float, state: APOState) -> bool:
+        """Add a frame received at ``now`` (seconds), return if sensors changed."""
+        before = self.published()
+        dt = 0.0 if self._time is None else min(max(now - self._time, 0), MAX_GAP)
+        energy = self._watts * dt / JOULES_PER_KWH
+        self.total_energy += energy
+
+        session = self.session
+        cook_id = state.raw_stages.cook_id
+        if cook_id and (session is None or session.cook_id != cook_id):
+            session = self.session = CookSession(cook_id, now)
+            if (_seconds_elapsed(state) or 0) > MAX_GAP:
+                self._passed = (_preheated(state), _probe_reached(state))
+            else:
+                self._passed = (False, False)
+        elif session is not None and session.cook_id == cook_id:
+            session.energy += energy
+            if self._steam:
+                session.steam_duration += dt
+        if session is not None and session.cook_id == cook_id:
+            # The oven's own cook time also holds across restarts.
+            if (elapsed := _seconds_elapsed(state)) is None:
+                elapsed = round(now - session.started)
+            preheat_passed, probe_passed = self._passed
+            if (
+                session.preheat_duration is None
+                and not preheat_passed
+                and _preheated(state)
+            ):
+                session.preheat_duration = elapsed
+            if (
+                session.probe_target_duration is None
+                and not probe_passed
+                and _probe_reached(state)
+            ):
+                session.probe_target_duration = elapsed
+
+        self._time = now
+        self._watts = _watts(state)
+        self._steam = _steam_on(state)
+        return self.published() != before
@@ -0,0 +1,330 @@
+"""Incremental decoder for EVENT_APO_STATE frames."""
+
+from __future__ import annotations
+
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from operator import attrgetter
+from typing import Any
+
+from .precision_oven import APOSensor, APOState, RawStages, Temperature
+from .util import snake_case_to_camel_case
+
+Path = tuple[str | Callable[[dict], str | None], ...]
+
+_MISSING = object()
+
+
+@dataclass(frozen=True, eq=False)
+class Field:
+    """Maps a JSON path (relative to the parent node) to a model field.
+
+    A field is either a plain value, a nested ``node`` or a ``convert`` function
+    applied to the values found at ``inputs`` followed by the decoded values of
+    the earlier ``siblings`` fields. Nested nodes and converted values are reused
+    from the previous state while their input stays the same.
+    """
+
+    name: str
+    path: Path = ()
+    default: Any = None
+    node: Node | None = None
+    convert: Callable[..., Any] | None = None
+    inputs: tuple[Path, ...] = ()
+    siblings: tuple[str, ...] = ()
+    get: Callable[[Any], Any] = field(init=False, repr=False)
+    get_inputs: Callable[[Any], tuple] = field(init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        getters = tuple(_compile(path) for path in self.inputs)
+        object.__setattr__(self, "get", _compile(self.path))
+        object.__setattr__(
+            self, "get_inputs", lambda raw: tuple([get(raw) for get in getters])
+        )
+
+
+@dataclass(frozen=True, eq=False)
+class Node:
+    """Describes how a model object is built from a JSON fragment."""
+
+    model: type
+    fields: tuple[Field, ...]
+    optional: bool = False
+    names: tuple[str, ...] = field(init=False, repr=False)
+    positions: dict[str, int] = field(init=False, repr=False)
+    keys: tuple[str, ...] | None = field(init=False, repr=False)
+    defaults: tuple[Any, ...] = field(init=False, repr=False)
+    values: Callable[[Any], tuple] = field(init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        names = tuple(f.name for f in self.fields)
+        getter = attrgetter(*names)
+        # Leaf nodes made of plain one-key fields are read with a single map().
+        leaf = all(
+            f.node is None
+            and f.convert is None
+            and len(f.path) == 1
+            and isinstance(f.path[0], str)
+            for f in self.fields
+        )
+        object.__setattr__(self, "names", names)
+        object.__setattr__(
+            self, "positions", {name: idx for idx, name in enumerate(names)}
+        )
+        object.__setattr__(
+            self, "keys", tuple(f.path[0] for f in self.fields) if leaf else None
+        )
+        object.__setattr__(self, "defaults", tuple(f.default for f in self.fields))
+        object.__setattr__(
+            self,
+            "values",
+            getter if len(names) > 1 else lambda obj: (getter(obj),),
+        )
+
+
+def _compile(path: Path) -> Callable[[Any], Any]:
+    """Build a getter returning the value at ``path`` or None if it is missing."""
+    if not path:
+        return lambda data: data
+    if any(callable(key) for key in path):
+
+        def get_dynamic(data: Any) -> Any:
+            for key in path:
+                if not isinstance(data, dict):
+                    return None
+                data = data.get(key(data) if callable(key) else key)
+            return data
+
+        return get_dynamic
+
+    def get(data: Any) -> Any:
+        try:
+            for key in path:
+                data = data[key]
+        except (KeyError, TypeError):
+            return None
+        return data
+
+    return get
+
+
+def _bulb(bulbs: dict) -> str | None:
+    return bulbs.get("mode")
+
+
+_HUMIDITY_KEYS = {None: "relativeHumidity", "idle": "relativeHumidity"}
+
+
+def _humidity(steam_generators: dict) -> str:
+    mode = steam_generators.get("mode")
+    if (key := _HUMIDITY_KEYS.get(mode)) is None:
+        key = _HUMIDITY_KEYS[mode] = snake_case_to_camel_case(mode)
+    return key
+
+
+def _stages(active_stage_id: str | None, raw_stages: RawStages) -> APOState.Stages:
+    return APOState.Stages(raw_stages.index(active_stage_id), len(raw_stages))
+
+
+_Nodes = APOSensor.Nodes
+
+TEMPERATURE = Node(
+    Temperature,
+    (
+        Field("celsius", ("celsius",)),
+        Field("fahrenheit", ("fahrenheit",)),
+    ),
+)
+OPTIONAL_TEMPERATURE = Node(Temperature, TEMPERATURE.fields, optional=True)
+
+HEATING_ELEMENT = Node(
+    _Nodes.HeatingElement,
+    (
+        Field("watts", ("watts",)),
+        Field("on", ("on",)),
+    ),
+)
+
+NODES = Node(
+    _Nodes,
+    (
+        Field(
+            "cook",
+            ("cook",),
+            node=Node(_Nodes.Cook, (Field("seconds_elapsed", ("secondsElapsed",), 0),)),
+        ),
+        Field(
+            "timer",
+            ("nodes", "timer"),
+            node=Node(
+                _Nodes.Timer,
+                (
+                    Field("mode", ("mode",)),
+                    Field("initial", ("initial",)),
+                    Field("current", ("current",)),
+                ),
+            ),
+        ),
+        Field(
+            "temperature_bulbs",
+            ("nodes", "temperatureBulbs"),
+            node=Node(
+                _Nodes.TemperatureBulbs,
+                (
+                    Field("mode", ("mode",)),
+                    Field("dosed", ("wet", "dosed")),
+                    Field("dose_failed", ("wet", "doseFailed")),
+                    Field("temperature", (_bulb, "current"), node=TEMPERATURE),
+                    Field("target_temperature", (_bulb, "setpoint"), node=TEMPERATURE),
+                ),
+            ),
+        ),
+        Field(
+            "temperature_probe",
+            ("nodes", "temperatureProbe"),
+            node=Node(
+                _Nodes.TemperatureProbe,
+                (
+                    Field("temperature", ("current",), node=OPTIONAL_TEMPERATURE),
+                    Field(
+                        "target_temperature", ("setpoint",), node=OPTIONAL_TEMPERATURE
+                    ),
+                ),
+                optional=True,
+            ),
+        ),
+        Field(
+            "steam_generator",
+            ("nodes", "steamGenerators"),
+            node=Node(
+                _Nodes.SteamGenerator,
+                (
+                    Field("mode", ("mode",)),
+                    Field("relative_humidity", (_humidity, "current")),
+                    Field("target_humidity", (_humidity, "setpoint"), 0),
+                ),
+            ),
+        ),
+        Field(
+            "rear_heating", ("nodes", "heatingElements", "rear"), node=HEATING_ELEMENT
+        ),
+        Field(
+            "bottom_heating",
+            ("nodes", "heatingElements", "bottom"),
+            node=HEATING_ELEMENT,
+        ),
+        Field("top_heating", ("nodes", "heatingElements", "top"), node=HEATING_ELEMENT),
+        Field("lamp_on", ("nodes", "lamp", "on")),
+        Field("door_closed", ("nodes", "door", "closed")),
+        Field("water_tank_empty", ("nodes", "waterTank", "empty")),
+        Field("fan_speed", ("nodes", "fan", "speed")),
+    ),
+)
+
+STATE = Node(
+    APOState,
+    (
+        Field(
+            "sensor",
+            node=Node(
+                APOSensor,
+                (
+                    Field("mode", ("state", "mode")),
+                    Field("firmware_version", ("systemInfo", "firmwareVersion")),
+                    Field("nodes", node=NODES),
+                ),
+            ),
+        ),
+        # Rebuilt only when the cook or its stages change.
+        Field(
+            "raw_stages",
+            convert=RawStages,
+            inputs=(("cook", "cookId"), ("cook", "stages")),
+        ),
+        Field(
+            "stages",
+            convert=_stages,
+            inputs=(("cook", "activeStageId"),),
+            siblings=("raw_stages",),
+        ),
+    ),
+)
+
+
+class StateDecoder:
+    """Decodes the ``state`` payload of EVENT_APO_STATE frames into APOState.
+
+    The JSON fragments behind every nested node and converted field are kept per
+    cooker. When a fragment equals the one from the previous frame the matching
+    sub-object of the previous state is reused, so only what changed is rebuilt.
+    """
+
+    def __init__(self) -> None:
+        self._cache: dict[str, tuple[APOState, dict[Field, Any]]] = {}
+
+    def decode(
+        self, cooker_id: str, raw: dict, previous: APOState | None = None
+    ) -> APOState:
+        """Decode ``raw`` reusing unchanged parts of ``previous``."""
+        last, fragments = self._cache.get(cooker_id, (None, None))
+        if fragments is None or last is not previous:
+            # Fragments only describe the state this decoder produced last.
+            fragments = {}
+        state = self._decode(STATE, raw, previous, fragments)
+        self._cache[cooker_id] = (state, fragments)
+        return state
+
+    def forget(self, cooker_id: str) -> None:
+        self._cache.pop(cooker_id, None)
+
+    def _decode(
+        self, node: Node, raw: Any, previous: Any, fragments: dict[Field, Any]
+    ) -> Any:
+        if not raw:
+            if node.optional:
+                return None
+            raw = {}
+
+        if node.keys is not None:
+            values = tuple(map(raw.get, node.keys))
+            if None in values:
+                values = tuple(
+                    default if value is None else value
+                    for value, default in zip(values, node.defaults)
+                )
+        else:
+            values = []
+            for f in node.fields:
+                if f.node is not None:
+                    fragment = f.get(raw)
+                    if (
+                        f.path
+                        and previous is not None
+                        and fragments.get(f, _MISSING) == fragment
+                    ):
+                        value = getattr(previous, f.name)
+                    else:
+                        if f.path:
+                            fragments[f] = fragment
+                        value = self._decode(
+                            f.node, fragment, getattr(previous, f.name, None), fragments
+                        )
+                elif f.convert is not None:
+                    args = f.get_inputs(raw)
+                    if f.siblings:
+                        args += tuple(
+                            values[node.positions[name]] for name in f.siblings
+                        )
+                    if previous is not None and fragments.get(f, _MISSING) == args:
+                        value = getattr(previous, f.name)
+                    else:
+                        fragments[f] = args
+                        value = f.convert(*args)
+                elif (value := f.get(raw)) is None:
+                    value = f.default
+                values.append(value)
+            values = tuple(values)
+
+        if previous is not None and values == node.values(previous):
+            return previous
+        return node.model(**dict(zip(node.names, values)))
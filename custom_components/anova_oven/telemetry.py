@@ -0,0 +1,168 @@
+"""In-memory telemetry history of the ovens."""
+
+from __future__ import annotations
+
+import math
+from array import array
+from collections.abc import Callable
+
+from .precision_oven import APOState
+
+NAN = math.nan
+
+
+def _probe_temperature(state: APOState) -> float:
+    probe = state.sensor.nodes.temperature_probe
+    if probe is None or probe.temperature is None:
+        return NAN
+    return probe.temperature.celsius
+
+
+# Channel -> value of a state, NaN when there is none. Temperatures are celsius.
+CHANNELS: dict[str, Callable[[APOState], float]] = {
+    "temperature": lambda s: s.sensor.nodes.temperature_bulbs.temperature.celsius,
+    "probe_temperature": _probe_temperature,
+    "humidity": lambda s: s.sensor.nodes.steam_generator.relative_humidity,
+    "rear_watts": lambda s: s.sensor.nodes.rear_heating.watts,
+    "bottom_watts": lambda s: s.sensor.nodes.bottom_heating.watts,
+    "top_watts": lambda s: s.sensor.nodes.top_heating.watts,
+}
+TEMPERATURE_CHANNELS = ("temperature", "probe_temperature")
+
+# Resolution in seconds -> number of samples kept (1 hour, 6 hours, 1 day).
+RESOLUTIONS: dict[int, int] = {1: 3600, 10: 2160, 60: 1440}
+
+
+class Ring:
+    """Fixed number of samples in preallocated arrays, one per channel."""
+
+    def __init__(self, size: int, channels: int) -> None:
+        self.size = size
+        self.times = array("d", bytes(8 * size))
+        self.values = [array("f", [NAN]) * size for _ in range(channels)]
+        self._next = 0
+        self._count = 0
+
+    def __len__(self) -> int:
+        return self._count
+
+    def append(self, time: float, values: list[float]) -> None:
+        idx = self._next
+        self.times[idx] = time
+        for column, value in zip(self.values, values):
+            column[idx] = value
+        self._next = (idx + 1) % self.size
+        self._count = min(self._count + 1, self.size)
+
+    def since(self, start: float) -> tuple[list[float], list[list[float]]]:
+        """Return the samples taken at or after ``start``, oldest first."""
+        first = (self._next - self._count) % self.size
+        order = [(first + i) % self.size for i in range(self._count)]
+        times = self.times
+        order = [idx for idx in order if times[idx] >= start]
+        return (
+            [times[idx] for idx in order],
+            [[column[idx] for idx in order] for column in self.values],
+        )
+
+
+class Level:
+    """Averages samples into buckets of ``resolution`` seconds."""
+
+    def __init__(self, resolution: int, size: int, channels: int) -> None:
+        self.resolution = resolution
+        self.ring = Ring(size, channels)
+        self._bucket: int | None = None
+        self._sums = [0.0] * channels
+        self._counts = [0] * channels
+
+    def add(self, time: float, values: list[float]) -> None:
+        bucket = int(time // self.resolution)
+        if bucket != self._bucket:
+            self.flush()
+            self._bucket = bucket
+        sums, counts = self._sums, self._counts
+        for idx, value in enumerate(values):
+            if value == value:  # not NaN
+                sums[idx] += value
+                counts[idx] += 1
+
+    def flush(self) -> None:
+        if self._bucket is None:
+            return
+        self.ring.append(
+            self._bucket * self.resolution,
+            [
+                total / count if count else NAN
+                for total, count in zip(self._sums, self._counts)
+            ],
+        )
+        self._bucket = None
+        self._sums = [0.0] * len(self._sums)
+        self._counts = [0] * len(self._counts)
+
+    def since(self, start: float) -> tuple[list[float], list[list[float]]]:
+        """Return the buckets from ``start`` on, including the one being filled."""
+        times, columns = self.ring.since(start)
+        if self._bucket is not None and self._bucket * self.resolution >= start:
+            times.append(float(self._bucket * self.resolution))
+            for column, total, count in zip(columns, self._sums, self._counts):
+                column.append(total / count if count else NAN)
+        return times, columns
+
+
+def _seconds_elapsed(state: APOState) -> float:
+    try:
+        return state.sensor.nodes.cook.seconds_elapsed or 0
+    except AttributeError:
+        return 0
+
+
+class OvenTelemetry:
+    """Telemetry history of one oven at several resolutions."""
+
+    def __init__(self) -> None:
+        self.levels = {
+            resolution: Level(resolution, size, len(CHANNELS))
+            for resolution, size in RESOLUTIONS.items()
+        }
+        self.cook_id: str | None = None
+        self.cook_started: float | None = None
+        self._getters = tuple(CHANNELS.values())
+
+    def record(self, time: float, state: APOState) -> None:
+        values = []
+        for getter in self._getters:
+            try:
+                value = getter(state)
+            except AttributeError:
+                value = None
+            values.append(NAN if value is None else float(value))
+        for level in self.levels.values():
+            level.add(time, values)
+
+        # The last cook is kept after it ended, until the next one starts.
+        cook_id = state.raw_stages.cook_id
+        if cook_id and cook_id != self.cook_id:
+            self.cook_id = cook_id
+            self.cook_started = time - _seconds_elapsed(state)
+
+    def history(
+        self,
+        resolution: int,
+        start: float | None = None,
+        channels: list[str] | None = None,
+    ) -> dict[str, list]:
+        """Return timestamps and the values of ``channels`` since ``start``.
+
+        Missing values are None.
+        """
+        times, columns = self.levels[resolution].since(start or 0)
+        return {
+            "timestamps": times,
+            **{
+                name: [None if v != v else round(v, 2) for v in column]
+                for name, column in zip(CHANNELS, columns)
+                if channels is None or name in channels
+            },
+        }
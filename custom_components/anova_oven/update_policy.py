@@ -0,0 +1,206 @@
+"""Per channel policies deciding when state changes reach the entities.
+
+The coordinator always keeps the latest state, a policy only holds back the
+notification of the entities. When they are notified they show the latest
+values, so nothing is lost.
+"""
+
+from __future__ import annotations
+
+import math
+from collections.abc import Callable, Mapping
+from dataclasses import dataclass
+from typing import Any
+
+from .precision_oven import APOState, Temperature
+
+IMMEDIATE = "immediate"
+THROTTLED = "throttled"
+SIGNIFICANT_CHANGE = "significant_change"
+POLICIES = (IMMEDIATE, THROTTLED, SIGNIFICANT_CHANGE)
+
+# Channel -> STATE_KEYS it covers. Keys of no channel (door, lamp, water tank,
+# mode, stages, ...) are always published immediately.
+CHANNELS: dict[str, tuple[str, ...]] = {
+    "temperature": ("temperature_bulbs",),
+    "probe": ("temperature_probe",),
+    "steam": ("steam_generator",),
+    "heating": ("rear_heating", "bottom_heating", "top_heating"),
+    "timer": ("timer", "cook"),
+    "fan": ("fan_speed",),
+}
+
+# Longest seconds a SIGNIFICANT_CHANGE key is held back, its latest value is
+# published then even if it moved less than the delta.
+MAX_HOLD = 60
+
+# Default seconds of THROTTLED and change of SIGNIFICANT_CHANGE per channel.
+DEFAULT_VALUES: dict[str, float] = {
+    "temperature": 0.5,
+    "probe": 0.5,
+    "steam": 2,
+    "heating": 100,
+    "timer": 10,
+    "fan": 10,
+}
+
+
+def _nodes(state: APOState) -> APOState:
+    return state.sensor.nodes
+
+
+def _probe(state: APOState, attr: str) -> Any:
+    probe = _nodes(state).temperature_probe
+    return probe and getattr(probe, attr)
+
+
+def _timer(state: APOState, attr: str) -> Any:
+    timer = _nodes(state).timer
+    return timer and getattr(timer, attr)
+
+
+def _heating(name: str) -> tuple[Callable, Callable]:
+    def element(state: APOState):
+        return getattr(_nodes(state), name)
+
+    return (lambda s: element(s).watts, lambda s: element(s).on)
+
+
+# State key -> (measured value, guard). A significant change is a change of the
+# value by the channel's delta, any change of the guard (setpoints, modes) is
+# significant on its own.
+SIGNIFICANCE: dict[str, tuple[Callable[[APOState], Any], Callable[[APOState], Any]]] = {
+    "temperature_bulbs": (
+        lambda s: _nodes(s).temperature_bulbs.temperature,
+        lambda s: (
+            _nodes(s).temperature_bulbs.mode,
+            _nodes(s).temperature_bulbs.target_temperature,
+            _nodes(s).temperature_bulbs.dosed,
+            _nodes(s).temperature_bulbs.dose_failed,
+        ),
+    ),
+    "temperature_probe": (
+        lambda s: _probe(s, "temperature"),
+        lambda s: _probe(s, "target_temperature"),
+    ),
+    "steam_generator": (
+        lambda s: _nodes(s).steam_generator.relative_humidity,
+        lambda s: (
+            _nodes(s).steam_generator.mode,
+            _nodes(s).steam_generator.target_humidity,
+        ),
+    ),
+    "rear_heating": _heating("rear_heating"),
+    "bottom_heating": _heating("bottom_heating"),
+    "top_heating": _heating("top_heating"),
+    "timer": (
+        lambda s: _timer(s, "current"),
+        lambda s: (_timer(s, "mode"), _timer(s, "initial")),
+    ),
+    "cook": (lambda s: _nodes(s).cook.seconds_elapsed, lambda s: None),
+    "fan_speed": (lambda s: _nodes(s).fan_speed, lambda s: None),
+}
+
+
+@dataclass(frozen=True, slots=True)
+class UpdatePolicy:
+    """``value`` is seconds for THROTTLED and the change for SIGNIFICANT_CHANGE."""
+
+    mode: str = IMMEDIATE
+    value: float = 0
+
+
+def policy_option(channel: str) -> str:
+    return f"{channel}_update_policy"
+
+
+def value_option(channel: str) -> str:
+    return f"{channel}_update_value"
+
+
+def update_policies(options: Mapping[str, Any]) -> dict[str, UpdatePolicy]:
+    """Read the channel policies of a config entry's options."""
+    return {
+        channel: UpdatePolicy(
+            options.get(policy_option(channel), IMMEDIATE),
+            options.get(value_option(channel), DEFAULT_VALUES[channel]),
+        )
+        for channel in CHANNELS
+    }
+
+
+class UpdateFilter:
+    """Selects the changed state keys of one oven to publish to its entities.
+
+    Held back keys stay pending until their policy lets them through: a
+    THROTTLED key when its interval has passed since it was last published, a
+    SIGNIFICANT_CHANGE key when its value moved enough from the published one
+    or MAX_HOLD seconds after it was last published.
+    """
+
+    def __init__(
+        self, policies: Mapping[str, UpdatePolicy], fahrenheit: bool = False
+    ) -> None:
+        self._policies = {
+            key: policy
+            for channel, policy in policies.items()
+            if policy.mode != IMMEDIATE
+            for key in CHANNELS[channel]
+        }
+        self._fahrenheit = fahrenheit
+        self._pending: set[str] = set()
+        self._published_at: dict[str, float] = {}
+        self._published: dict[str, tuple[Any, Any]] = {}
+
+    def __bool__(self) -> bool:
+        return bool(self._policies)
+
+    def _sample(self, key: str, state: APOState) -> tuple[Any, Any]:
+        measure, guard = SIGNIFICANCE[key]
+        try:
+            value, guarded = measure(state), guard(state)
+        except AttributeError:
+            return None, None
+        if isinstance(value, Temperature):
+            value = value.fahrenheit if self._fahrenheit else value.celsius
+        return value, guarded
+
+    def _significant(self, key: str, delta: float, state: APOState) -> bool:
+        if (last := self._published.get(key)) is None:
+            return True
+        value, guarded = self._sample(key, state)
+        return (
+            guarded != last[1]
+            or value is None
+            or last[0] is None
+            or abs(value - last[0]) >= delta
+        )
+
+    def select(
+        self, now: float, state: APOState, changed: set[str]
+    ) -> tuple[set[str], float | None]:
+        """Return the keys to publish and when held back keys are due, if ever."""
+        if not self._policies:
+            return changed, None
+        publish = set()
+        due = math.inf
+        for key in changed | self._pending:
+            if (policy := self._policies.get(key)) is None:
+                publish.add(key)
+            elif policy.mode == THROTTLED:
+                at = self._published_at.get(key, -math.inf) + policy.value
+                if now >= at:
+                    publish.add(key)
+                    self._published_at[key] = now
+                else:
+                    due = min(due, at)
+            else:
+                at = self._published_at.get(key, -math.inf) + MAX_HOLD
+                if now >= at or self._significant(key, policy.value, state):
+                    publish.add(key)
+                    self._published_at[key] = now
+                    self._published[key] = self._sample(key, state)
+                else:
+                    due = min(due, at)
+        self._pending = (changed | self._pending) - publish
+        return publish, due if self._pending and due < math.inf else None
@@ -1,38 +1,64 @@
+import base64
+import json
+import math
 import re
+import time
+from collections.abc import Callable
 from dataclasses import fields, is_dataclass
+from functools import lru_cache
 
 
+_WORD_SEPARATOR_RE = re.compile("-|_")
+_CAMEL_WORD_RE = re.compile("(.)([A-Z][a-z]+)")
+_CAMEL_BOUNDARY_RE = re.compile("([a-z0-9])([A-Z])")
+
+
+# Keys come from a small fixed vocabulary, translations are cached.
+@lru_cache(maxsize=1024)
 def snake_case_to_camel_case(input_string):
-    words = re.split("-|_", input_string)
+    words = _WORD_SEPARATOR_RE.split(input_string)
     camel_case_words = [words[0]] + [word.capitalize() for word in words[1:]]
     return "".join(camel_case_words)
 
 
+@lru_cache(maxsize=1024)
 def camel_to_snake(name):
-    s1 = re.sub("(.)([A-Z][a-z]+)", r"\1_\2", name)
-    return re.sub("([a-z0-9])([A-Z])", r"\1_\2", s1).lower()
+    s1 = _CAMEL_WORD_RE.sub(r"\1_\2", name)
+    return _CAMEL_BOUNDARY_RE.sub(r"\1_\2", s1).lower()
 
 
-def dict_keys_to_camel_case(data: dict):
+def _convert_keys(data: dict, convert: Callable[[str], str]) -> dict:
+    """Copy nested dicts and lists renaming every dict key with ``convert``."""
     res = {}
-    for k, v in data.items():
-        if isinstance(v, dict):
-            v = dict_keys_to_camel_case(v)
-        elif isinstance(v, list):
-            v = [dict_keys_to_camel_case(x) for x in v]
-        res[snake_case_to_camel_case(k)] = v
+    # (source, copy) containers still to be filled.
+    stack: list[tuple[dict | list, dict | list]] = [(data, res)]
+
+    def copy(value):
+        if isinstance(value, dict):
+            new = {}
+        elif isinstance(value, list):
+            new = []
+        else:
+            return value
+        stack.append((value, new))
+        return new
+
+    while stack:
+        src, dst = stack.pop()
+        if isinstance(dst, dict):
+            for k, v in src.items():
+                dst[convert(k)] = copy(v)
+        else:
+            dst.extend([copy(v) for v in src])
     return res
 
 
+def dict_keys_to_camel_case(data: dict):
+    return _convert_keys(data, snake_case_to_camel_case)
+
+
 def dict_keys_to_snake_case(data: dict):
-    res = {}
-    for k, v in data.items():
-        if isinstance(v, dict):
-            v = dict_keys_to_snake_case(v)
-        elif isinstance(v, list):
-            v = [dict_keys_to_snake_case(x) for x in v]
-        res[camel_to_snake(k)] = v
-    return res
+    return _convert_keys(data, camel_to_snake)
 
 
 def to_fahrenheit(celsius: int):
@@ -44,14 +70,67 @@ def to_celsius(fahrenheit):
     return celsius
 
 
-def to_dict(instance):
+# Serialization plans: dataclass -> ((attribute, camelCase key), ...).
+_PLANS: dict[type, tuple[tuple[str, str], ...]] = {}
+_SCALARS = frozenset({str, int, float, bool})
+
+
+def _plan(cls: type) -> tuple[tuple[str, str], ...]:
+    plan = _PLANS[cls] = tuple(
+        (field.name, snake_case_to_camel_case(field.name)) for field in fields(cls)
+    )
+    return plan
+
+
+def _serialize(value):
+    cls = type(value)
+    if cls in _SCALARS:
+        return value
+    if (plan := _PLANS.get(cls)) is None:
+        if cls is list:
+            return [_serialize(x) for x in value]
+        if cls is dict:
+            return dict_keys_to_camel_case(value)
+        if not is_dataclass(cls):
+            return value
+        plan = _plan(cls)
     res = {}
-    for field in fields(instance):
-        value = getattr(instance, field.name)
-        if is_dataclass(value):
-            value = to_dict(value)
-        elif isinstance(value, list):
-            value = [to_dict(x) if is_dataclass(x) else x for x in value]
-        if value is not None:
-            res[field.name] = value
+    for name, key in plan:
+        if (item := getattr(value, name)) is not None:
+            res[key] = _serialize(item)
     return res
+
+
+def to_camel_case_dict(instance) -> dict:
+    """Serialize a dataclass to a camelCase dict, skipping None fields.
+
+    Field names are translated once per class. Plain dicts found on the way
+    (e.g. stages given as JSON) get their keys converted as well.
+    """
+    return _serialize(instance)
+
+
+def _token_claims(token: str) -> dict:
+    """Return the payload of a JWT without verifying it, empty if unreadable."""
+    try:
+        payload = token.split(".")[1]
+        claims = json.loads(
+            base64.urlsafe_b64decode(payload + "=" * (-len(payload) % 4))
+        )
+    except (AttributeError, IndexError, TypeError, ValueError):
+        return {}
+    return claims if isinstance(claims, dict) else {}
+
+
+def token_expires_in(token: str) -> float:
+    """Seconds until the ``exp`` claim of a JWT, infinite if it can't be read."""
+    try:
+        return _token_claims(token)["exp"] - time.time()
+    except (KeyError, TypeError):
+        return math.inf
+
+
+def token_user_id(token: str) -> str | None:
+    """Return the user id (``user_id`` or ``sub`` claim) of a JWT."""
+    claims = _token_claims(token)
+    return claims.get("user_id") or claims.get("sub")